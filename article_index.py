@@ -0,0 +1,113 @@
+"""
+Article Index - Persistent record of articles already turned into posts
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+
+NEW = 'new'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+
+class SeenArticleIndex:
+    """
+    Remember posted article URLs with fingerprints of their title and content
+    
+    Used for incremental runs: an article is only processed again when its URL
+    is new or its fingerprint changed since the post was generated.
+    """
+    
+    def __init__(self, path: str = '.cache/seen_articles.db'):
+        """
+        Initialize the index
+        
+        Args:
+            path: SQLite database file
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS seen_articles (
+                url TEXT PRIMARY KEY,
+                title_hash TEXT NOT NULL,
+                content_hash TEXT,
+                first_seen REAL NOT NULL,
+                last_posted REAL NOT NULL
+            )"""
+        )
+        self.db.commit()
+    
+    @staticmethod
+    def fingerprint(text: str) -> str:
+        """Whitespace-insensitive hash of a title or article body"""
+        return hashlib.sha256(' '.join(text.split()).encode('utf-8')).hexdigest()
+    
+    def classify(self, article: Dict) -> str:
+        """
+        Compare a crawled article against the index by URL and title
+        
+        Returns:
+            NEW, CHANGED or UNCHANGED
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT title_hash FROM seen_articles WHERE url = ?", (article['url'],)
+            ).fetchone()
+        
+        if row is None:
+            return NEW
+        if row[0] != self.fingerprint(article['title']):
+            return CHANGED
+        return UNCHANGED
+    
+    def content_changed(self, article: Dict, content: str) -> bool:
+        """
+        Whether extracted content differs from what was last posted
+        
+        Articles posted from their title only have no content fingerprint yet;
+        the current content becomes their baseline and counts as unchanged.
+        """
+        if not content:
+            return False
+        
+        content_hash = self.fingerprint(content)
+        with self.lock:
+            row = self.db.execute(
+                "SELECT content_hash FROM seen_articles WHERE url = ?", (article['url'],)
+            ).fetchone()
+            
+            if row is not None and row[0] is None:
+                self.db.execute(
+                    "UPDATE seen_articles SET content_hash = ? WHERE url = ?", (content_hash, article['url'])
+                )
+                self.db.commit()
+                return False
+        
+        return row is None or row[0] != content_hash
+    
+    def mark_posted(self, article: Dict, content: str = ""):
+        """Record that a post was generated for an article"""
+        now = time.time()
+        content_hash = self.fingerprint(content) if content else None
+        
+        with self.lock:
+            self.db.execute(
+                """INSERT INTO seen_articles (url, title_hash, content_hash, first_seen, last_posted)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    title_hash = excluded.title_hash,
+                    content_hash = excluded.content_hash,
+                    last_posted = excluded.last_posted""",
+                (article['url'], self.fingerprint(article['title']), content_hash, now, now)
+            )
+            self.db.commit()
+    
+    def close(self):
+        with self.lock:
+            self.db.close()
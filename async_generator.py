@@ -0,0 +1,297 @@
+"""
+Async Post Generator - Generate LinkedIn posts on AsyncOpenAI with retries, timeouts and streaming
+"""
+import asyncio
+import itertools
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+import openai
+from openai import AsyncOpenAI
+
+from generation_cache import GenerationCache
+from metrics import METRICS, span
+from post_generator import PostGenerator
+from prompt_budget import PromptBudget
+from rate_limiter import RateLimiter
+
+# Statuses worth retrying besides 5xx: request timeout, conflict, rate limit
+RETRY_STATUSES = {408, 409, 429}
+
+
+class GenerationError(Exception):
+    """A post could not be generated"""
+    
+    def __init__(self, message: str, status: Optional[int] = None, retryable: bool = False,
+                 retry_after: Optional[float] = None, attempts: int = 1):
+        """
+        Initialize the error
+        
+        Args:
+            message: What went wrong
+            status: HTTP status of the failed response (None for timeouts and connection errors)
+            retryable: Whether the same request may succeed later (rate limits, server errors, timeouts)
+            retry_after: Seconds the server asked clients to wait (Retry-After), if it said
+            attempts: Requests made before giving up
+        """
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+        self.attempts = attempts
+    
+    def __str__(self) -> str:
+        if self.attempts > 1:
+            return f"{self.message} (after {self.attempts} attempts)"
+        return self.message
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """Seconds to wait from retry-after-ms or Retry-After (seconds or HTTP date), if present"""
+    value = headers.get('retry-after-ms')
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: Exception) -> GenerationError:
+    """Turn a client exception into a GenerationError that says whether to retry"""
+    if isinstance(error, GenerationError):
+        return error
+    # APITimeoutError is also an APIConnectionError, so check it first
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, openai.APITimeoutError)):
+        return GenerationError("request timed out", retryable=True)
+    if isinstance(error, openai.APIConnectionError):
+        return GenerationError(f"connection error: {str(error)}", retryable=True)
+    if isinstance(error, openai.APIStatusError):
+        status = error.status_code
+        # The API's own error message when the body has one
+        body = error.body if isinstance(error.body, dict) else {}
+        detail = body.get('message') if isinstance(body.get('message'), str) else error.message
+        return GenerationError(
+            f"HTTP {status}: {detail}",
+            status=status,
+            retryable=status in RETRY_STATUSES or status >= 500,
+            retry_after=parse_retry_after(error.response.headers)
+        )
+    return GenerationError(f"{type(error).__name__}: {str(error)}")
+
+
+class AsyncPostGenerator(PostGenerator):
+    """
+    Generate LinkedIn posts using AsyncOpenAI
+    
+    Failed requests raise GenerationError instead of returning an error
+    string. Rate limits, server errors and timeouts are retried with
+    jittered exponential backoff, waiting at least as long as the server's
+    Retry-After. The synchronous PostGenerator methods (packing, batches)
+    keep working on the same instance.
+    """
+    
+    def __init__(self, api_key: str, custom_hashtags: str = "",
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[GenerationCache] = None,
+                 force_regenerate: bool = False,
+                 base_url: Optional[str] = None,
+                 budget: Optional[PromptBudget] = None,
+                 timeout: float = 60.0,
+                 max_retries: int = 4,
+                 stream: bool = False,
+                 backoff_base: float = 1.0,
+                 backoff_max: float = 30.0):
+        """
+        Initialize the generator
+        
+        Args:
+            api_key: OpenAI API key
+            custom_hashtags: Custom hashtags to append to posts
+            rate_limiter: Optional limiter shared by all concurrent generate calls
+            cache: Optional cache of previously generated posts
+            force_regenerate: Skip cache lookups (new posts are still stored)
+            base_url: Optional OpenAI-compatible API endpoint (default: api.openai.com)
+            budget: Token counter and content budget (default: the shared one from prompt_budget)
+            timeout: Seconds one request may take, including a streamed answer
+            max_retries: Retries after the first attempt for retryable errors
+            stream: Stream tokens, recording first-token latency as the 'llm_first_token' stage
+            backoff_base: Backoff ceiling in seconds for the first retry (doubles per retry)
+            backoff_max: Upper limit of the backoff ceiling
+        """
+        super().__init__(api_key, custom_hashtags, rate_limiter=rate_limiter, cache=cache,
+                         force_regenerate=force_regenerate, base_url=base_url, budget=budget)
+        # Retries are handled here, so the SDK's own are switched off
+        self.async_client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.stream = stream
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.random = random.Random()
+        self.retries = 0
+        self.failures = 0
+        self.loop = None  # Event loop thread used by run()
+    
+    async def generate_async(self, article: Dict, content: str = "") -> str:
+        """
+        Generate a LinkedIn post for an article
+        
+        Args:
+            article: Dict with 'title' and 'url' keys
+            content: Optional article content for better posts
+        
+        Returns:
+            Generated LinkedIn post text with custom hashtags
+        
+        Raises:
+            GenerationError: The request failed and retrying did not help (or could not)
+        """
+        with span('prompt_build', source=article.get('source'), article=article['url']):
+            prompt = self._build_prompt(article, content)
+        
+        cache_key, cached = self._lookup(prompt)
+        if cached is not None:
+            return self._finish(cached)
+        
+        post = await self._complete_async(prompt, source=article.get('source'), article_url=article['url'])
+        if cache_key:
+            self.cache.put(cache_key, post)
+        return self._finish(post)
+    
+    async def generate_all(self, items: List[Tuple[Dict, str]],
+                           concurrency: int = 4) -> List[Union[str, GenerationError]]:
+        """
+        Generate posts for several articles concurrently
+        
+        Args:
+            items: (article, content) pairs
+            concurrency: Requests in flight at once
+        
+        Returns:
+            One post or GenerationError per item, in input order
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def generate_one(article: Dict, content: str) -> Union[str, GenerationError]:
+            async with semaphore:
+                try:
+                    return await self.generate_async(article, content)
+                except GenerationError as e:
+                    return e
+        
+        return list(await asyncio.gather(*(generate_one(article, content) for article, content in items)))
+    
+    def run(self, coroutine):
+        """
+        Run a coroutine on the generator's event loop and wait for its result
+        
+        Safe to call from many threads at once (e.g. pipeline workers); the
+        loop is started on first use and keeps the client's connections.
+        """
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+    
+    def close(self):
+        """Close the client and stop the event loop started by run()"""
+        with self.lock:
+            loop, self.loop = self.loop, None
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(loop), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+    
+    async def _shutdown(self, loop: asyncio.AbstractEventLoop):
+        await self.async_client.close()
+        await loop.shutdown_asyncgens()  # Finish streamed responses left open by timeouts
+    
+    def retry_summary(self) -> str:
+        return f"{self.retries} retries, {self.failures} requests failed"
+    
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before retry number `attempt`
+        
+        Full jitter: a random delay up to an exponentially growing ceiling,
+        so clients that failed together do not retry together. Never shorter
+        than the server's Retry-After.
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        delay = self.random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+    
+    async def _complete_async(self, prompt: str, source: Optional[str] = None,
+                              article_url: Optional[str] = None) -> str:
+        """One rate-limited chat completion with retries; returns the stripped message text"""
+        for attempt in itertools.count(1):
+            if self.rate_limiter:
+                wait = self.rate_limiter.reserve(self.estimate_tokens(prompt))
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            
+            try:
+                with span('llm_call', source=source, article=article_url):
+                    return await asyncio.wait_for(self._request(prompt, source, article_url), self.timeout)
+            except Exception as e:
+                cause = e
+                error = classify_error(e)
+            
+            error.attempts = attempt
+            if not error.retryable or attempt > self.max_retries:
+                with self.lock:
+                    self.failures += 1
+                raise error from cause
+            
+            delay = self.backoff(attempt, error.retry_after)
+            with self.lock:
+                self.retries += 1
+            print(f"  ⚠ {error.message}; retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
+    async def _request(self, prompt: str, source: Optional[str], article_url: Optional[str]) -> str:
+        """Send one chat completion request, streamed when enabled"""
+        started = time.perf_counter()
+        response = await self.async_client.chat.completions.create(
+            model=self.MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=self.TEMPERATURE,
+            max_tokens=self.MAX_TOKENS,
+            stream=self.stream
+        )
+        
+        if not self.stream:
+            text = response.choices[0].message.content or ""
+        else:
+            parts = []
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                if not parts:
+                    METRICS.record('llm_first_token', time.perf_counter() - started, source, article_url)
+                parts.append(delta)
+            text = ''.join(parts)
+        
+        if not text.strip():
+            raise GenerationError("empty completion")
+        return text.strip()
@@ -0,0 +1,3 @@
+"""
+Benchmarks - Offline performance measurements for crawlers and generation
+"""
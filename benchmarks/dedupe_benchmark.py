@@ -0,0 +1,95 @@
+"""
+Dedupe Benchmark - Near-duplicate detection accuracy and scaling, LSH index vs. all pairs
+
+Builds synthetic articles from the fixture word list, a share of them
+lightly edited copies of others (retitled, some words changed), and runs
+them through Deduplicator. The same signatures are then compared pair by
+pair to show how the LSH index avoids quadratic work.
+
+Usage:
+    python3 -m benchmarks.dedupe_benchmark [--sizes 500 1000 2000 4000] [--json]
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, List, Tuple
+
+from dedupe import Deduplicator
+
+
+def synthetic_articles(count: int, duplicate_rate: float = 0.1, seed: int = 0) -> Tuple[List[Tuple[Dict, str]], set]:
+    """
+    (article, content) pairs, `duplicate_rate` of them near-duplicates of an earlier one
+    
+    Returns:
+        The pairs, and the URLs of the near-duplicates
+    """
+    rng = random.Random(seed)
+    words = [f"{rng.choice('bcdfgklmnprstvz')}{rng.choice('aeiou')}{rng.choice('bcdfgklmnprstvz')}"
+             f"{rng.choice('aeiou')}{i}" for i in range(5000)]
+    items, duplicates = [], set()
+    for i in range(count):
+        url = f"https://example.com/blog/{i}"
+        if items and rng.random() < duplicate_rate:
+            original, content = rng.choice(items)
+            body = content.split()
+            for position in rng.sample(range(len(body)), len(body) // 50):
+                body[position] = rng.choice(words)
+            items.append(({'title': f"{original['title']} (repost)", 'url': url, 'source': 'Copy'}, ' '.join(body)))
+            duplicates.add(url)
+        else:
+            title = ' '.join(rng.choice(words) for _ in range(8))
+            items.append(({'title': title, 'url': url, 'source': 'Blog'}, ' '.join(rng.choice(words) for _ in range(110))))
+    return items, duplicates
+
+
+def run(sizes: List[int]) -> Dict[int, Dict]:
+    results = {}
+    for size in sizes:
+        items, expected = synthetic_articles(size)
+        deduplicator = Deduplicator()
+        
+        start = time.perf_counter()
+        found = {article['url'] for article, content in items if deduplicator.check(article, content)}
+        lsh_seconds = time.perf_counter() - start
+        
+        # Every kept signature against every other one: what the index saves
+        signatures = list(deduplicator.index.signatures.values())
+        start = time.perf_counter()
+        for i, first in enumerate(signatures):
+            for second in signatures[:i]:
+                deduplicator.hasher.similarity(first, second)
+        pairs_seconds = time.perf_counter() - start
+        
+        results[size] = {
+            'duplicates_expected': len(expected),
+            'duplicates_found': len(found),
+            'recall': len(found & expected) / len(expected) if expected else 1.0,
+            'precision': len(found & expected) / len(found) if found else 1.0,
+            'lsh_ms': lsh_seconds * 1000,
+            'all_pairs_ms': pairs_seconds * 1000,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate detection")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 1000, 2000, 4000], help="articles per run")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.sizes)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    for size, r in results.items():
+        print(f"{size:>6} articles: {r['duplicates_found']}/{r['duplicates_expected']} duplicates found "
+              f"(recall {r['recall']:.2f}, precision {r['precision']:.2f}), "
+              f"LSH {r['lsh_ms']:8.1f} ms (hashing included), all pairs {r['all_pairs_ms']:8.1f} ms (comparisons only)")
+
+
+if __name__ == "__main__":
+    main()
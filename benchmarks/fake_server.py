@@ -0,0 +1,400 @@
+"""
+Fake Server - Local stand-in for the blog sites and the OpenAI API
+
+Blog pages are served from benchmarks.fixtures under /<host>/<path>, with
+ETag support so conditional GETs can be exercised. /v1/chat/completions
+answers like the OpenAI API with configurable latency and injected errors
+(random, or a scripted sequence of failures per prompt for retry scenarios),
+streaming server-sent events when asked to; /v1/files and /v1/batches emulate
+the Batch API, finishing each batch after `batch_latency` seconds.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from benchmarks.fixtures import INDEX_URLS, load_page
+
+
+class FakeServer:
+    """Threaded local HTTP server replaying fixtures and faking chat completions"""
+    
+    def __init__(self, llm_latency: float = 0.5, error_rate: float = 0.0, seed: int = 0,
+                 batch_latency: float = 1.0, faults: Optional[List[Union[int, str]]] = None,
+                 retry_after: Optional[str] = '0', stall: float = 5.0,
+                 first_token_latency: Optional[float] = None, batch_missing: int = 0,
+                 batch_refusals: int = 0):
+        """
+        Initialize the server (call start() to listen)
+        
+        Args:
+            llm_latency: Seconds each chat completion takes
+            error_rate: Fraction of chat completions answered with 429/500
+            seed: Random seed for error injection
+            batch_latency: Seconds before a submitted batch completes
+            faults: Scripted failures for the first attempts at each prompt, in order:
+                an HTTP status, or 'stall' to answer `stall` seconds late (client timeouts)
+            retry_after: Retry-After header sent with error responses (None = no header)
+            stall: Extra seconds a 'stall' fault waits before answering
+            first_token_latency: Seconds before the first streamed token (default: a fifth of llm_latency)
+            batch_missing: Requests at the end of each batch left out of both result files
+            batch_refusals: Requests at the start of each batch answered with null content and a refusal
+        """
+        self.llm_latency = llm_latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.batch_latency = batch_latency
+        self.faults = list(faults or [])
+        self.retry_after = retry_after
+        self.stall = stall
+        self.first_token_latency = llm_latency / 5 if first_token_latency is None else first_token_latency
+        self.batch_missing = batch_missing
+        self.batch_refusals = batch_refusals
+        self.attempts = {}  # prompt hash -> chat completion requests received
+        self.counts = {'pages': 0, 'not_modified': 0, 'completions': 0, 'errors': 0, 'batches': 0,
+                       'prompt_tokens': 0, 'stalls': 0, 'streams': 0}
+        self.files = {}  # file id -> (filename, purpose, bytes)
+        self.batches = {}  # batch id -> batch object
+        self.httpd = None
+        self.thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> 'FakeServer':
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real sites
+            
+            def do_GET(self):
+                if self.path.startswith('/v1/'):
+                    server._serve_batch_api(self)
+                else:
+                    server._serve_page(self)
+            
+            def do_POST(self):
+                if self.path.startswith(('/v1/files', '/v1/batches')):
+                    server._serve_batch_api(self)
+                else:
+                    server._serve_completion(self)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        class Server(ThreadingHTTPServer):
+            def handle_error(self, request, client_address):
+                pass  # Clients legitimately hang up mid-response (streamed extraction)
+        
+        self.httpd = Server(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+    
+    def _count(self, key: str, amount: int = 1):
+        with self.lock:
+            self.counts[key] += amount
+    
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, body: bytes,
+              headers: Optional[Dict[str, str]] = None):
+        handler.send_response(status)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+    
+    def _serve_page(self, handler: BaseHTTPRequestHandler):
+        # /<host>/<path> -> https://<host>/<path>
+        host, _, path = handler.path.lstrip('/').partition('/')
+        body = load_page(f"https://{host}/{path}")
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        
+        if handler.headers.get('If-None-Match') == etag:
+            self._count('not_modified')
+            self._send(handler, 304, b'', {'ETag': etag})
+            return
+        
+        self._count('pages')
+        self._send(handler, 200, body, {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag})
+    
+    def _send_json(self, handler: BaseHTTPRequestHandler, status: int, payload: Dict):
+        self._send(handler, status, json.dumps(payload).encode('utf-8'), {'Content-Type': 'application/json'})
+    
+    def _serve_completion(self, handler: BaseHTTPRequestHandler):
+        length = int(handler.headers.get('Content-Length', 0))
+        request = json.loads(handler.rfile.read(length) or b'{}')
+        
+        if not handler.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(handler, 404, {'error': {'message': 'not found'}})
+            return
+        
+        streaming = bool(request.get('stream'))
+        fault = self._scripted_fault(request)
+        if fault == 'stall':
+            self._count('stalls')
+        # Streamed answers start after the first-token latency; the rest arrives token by token
+        time.sleep((self.first_token_latency if streaming else self.llm_latency)
+                   + (self.stall if fault == 'stall' else 0))
+        
+        if isinstance(fault, int):
+            self._count('errors')
+            status = fault
+        else:
+            status = self._injected_status()
+        if status != 200:
+            body = json.dumps({'error': {'message': 'injected error', 'type': 'server_error'}}).encode('utf-8')
+            headers = {'Content-Type': 'application/json'}
+            if self.retry_after is not None:
+                headers['Retry-After'] = self.retry_after
+            self._send(handler, status, body, headers)
+            return
+        
+        self._count('completions')
+        response = completion(request)
+        self._count('prompt_tokens', response['usage']['prompt_tokens'])
+        if streaming:
+            self._count('streams')
+            self._send_stream(handler, response)
+        else:
+            self._send_json(handler, 200, response)
+    
+    def _scripted_fault(self, request: Dict) -> Optional[Union[int, str]]:
+        """The scripted fault for this attempt at the request's prompt, if any are left"""
+        if not self.faults:
+            return None
+        key = hashlib.sha1(json.dumps(request.get('messages'), sort_keys=True).encode('utf-8')).hexdigest()
+        with self.lock:
+            attempt = self.attempts.get(key, 0)
+            self.attempts[key] = attempt + 1
+        return self.faults[attempt] if attempt < len(self.faults) else None
+    
+    def _send_stream(self, handler: BaseHTTPRequestHandler, response: Dict):
+        """Answer as server-sent chat.completion.chunk events, spreading the rest of llm_latency over the tokens"""
+        words = re.findall(r'\S+\s*', response['choices'][0]['message']['content'])
+        delay = max(0.0, self.llm_latency - self.first_token_latency) / max(1, len(words))
+        
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'text/event-stream')
+        handler.send_header('Transfer-Encoding', 'chunked')
+        handler.end_headers()
+        
+        def send_event(delta: Dict, finish_reason: Optional[str] = None):
+            chunk = {
+                'id': response['id'], 'object': 'chat.completion.chunk', 'created': response['created'],
+                'model': response['model'],
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            }
+            write_chunk(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+        
+        def write_chunk(data: bytes):
+            handler.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+            handler.wfile.flush()
+        
+        for position, word in enumerate(words):
+            if position:
+                time.sleep(delay)
+            send_event({'role': 'assistant', 'content': word} if position == 0 else {'content': word})
+        send_event({}, 'stop')
+        write_chunk(b"data: [DONE]\n\n")
+        handler.wfile.write(b"0\r\n\r\n")
+    
+    def _injected_status(self) -> int:
+        """200, or 429/500 for the configured fraction of requests"""
+        with self.lock:
+            fail = self.random.random() < self.error_rate
+            status = self.random.choice([429, 500]) if fail else 200
+        if fail:
+            self._count('errors')
+        return status
+    
+    def _serve_batch_api(self, handler: BaseHTTPRequestHandler):
+        """Files and Batches endpoints used by PostGenerator.generate_batch"""
+        parts = handler.path.split('?')[0].strip('/').split('/')[1:]  # drop 'v1'
+        length = int(handler.headers.get('Content-Length', 0))
+        body = handler.rfile.read(length) if length else b''
+        
+        if handler.command == 'POST' and parts == ['files']:
+            # multipart/form-data with 'purpose' and 'file' fields
+            message = BytesParser().parsebytes(
+                f"Content-Type: {handler.headers['Content-Type']}\r\n\r\n".encode('utf-8') + body
+            )
+            fields = {part.get_param('name', header='content-disposition'): part for part in message.get_payload()}
+            data = fields['file'].get_payload(decode=True)
+            filename = fields['file'].get_filename() or 'upload.jsonl'
+            purpose = fields['purpose'].get_payload(decode=True).decode('utf-8')
+            self._send_json(handler, 200, self._add_file(filename, purpose, data))
+        elif handler.command == 'GET' and len(parts) == 3 and parts[0] == 'files' and parts[2] == 'content':
+            if parts[1] not in self.files:
+                self._send_json(handler, 404, {'error': {'message': 'no such file'}})
+                return
+            self._send(handler, 200, self.files[parts[1]][2], {'Content-Type': 'application/octet-stream'})
+        elif handler.command == 'POST' and parts == ['batches']:
+            request = json.loads(body or b'{}')
+            self._send_json(handler, 200, self._create_batch(request))
+        elif handler.command == 'GET' and len(parts) == 2 and parts[0] == 'batches':
+            with self.lock:
+                batch = self.batches.get(parts[1])
+            if batch is None:
+                self._send_json(handler, 404, {'error': {'message': 'no such batch'}})
+                return
+            self._send_json(handler, 200, batch)
+        else:
+            self._send_json(handler, 404, {'error': {'message': 'not found'}})
+    
+    def _add_file(self, filename: str, purpose: str, data: bytes) -> Dict:
+        with self.lock:
+            file_id = f"file-{len(self.files) + 1}"
+            self.files[file_id] = (filename, purpose, data)
+        return {
+            'id': file_id, 'object': 'file', 'bytes': len(data), 'created_at': int(time.time()),
+            'filename': filename, 'purpose': purpose, 'status': 'processed',
+        }
+    
+    def _create_batch(self, request: Dict) -> Dict:
+        """Register a batch and finish it in the background after batch_latency"""
+        self._count('batches')
+        with self.lock:
+            batch_id = f"batch-{len(self.batches) + 1}"
+            batch = {
+                'id': batch_id, 'object': 'batch', 'endpoint': request.get('endpoint'),
+                'input_file_id': request.get('input_file_id'), 'completion_window': request.get('completion_window'),
+                'status': 'in_progress', 'created_at': int(time.time()),
+                'output_file_id': None, 'error_file_id': None,
+            }
+            self.batches[batch_id] = batch
+        threading.Thread(target=self._finish_batch, args=(batch_id,), daemon=True).start()
+        return dict(batch)
+    
+    def _finish_batch(self, batch_id: str):
+        time.sleep(self.batch_latency)
+        with self.lock:
+            batch = self.batches[batch_id]
+            data = self.files.get(batch['input_file_id'], ('', '', b''))[2]
+        
+        requests_in = [json.loads(line) for line in data.decode('utf-8').splitlines() if line.strip()]
+        if self.batch_missing:
+            requests_in = requests_in[:-self.batch_missing]
+        
+        outputs, errors = [], []
+        for position, request in enumerate(requests_in):
+            status = self._injected_status()
+            record = {'id': f"batch_req_{request['custom_id']}", 'custom_id': request['custom_id']}
+            if status == 200:
+                self._count('completions')
+                body = completion(request['body'])
+                if position < self.batch_refusals:
+                    body['choices'][0]['message'] = {'role': 'assistant', 'content': None,
+                                                     'refusal': "I can't help with that."}
+                outputs.append(dict(record, response={'status_code': 200, 'body': body}, error=None))
+            else:
+                error = {'message': 'injected error', 'type': 'server_error'}
+                errors.append(dict(record, response={'status_code': status, 'body': {'error': error}}, error=None))
+        # The API does not keep input order; reversing makes callers map results by custom_id
+        outputs.reverse()
+        
+        output_file = self._add_file(f"{batch_id}_output.jsonl", 'batch_output',
+                                     ''.join(json.dumps(r) + '\n' for r in outputs).encode('utf-8'))
+        error_file = None
+        if errors:
+            error_file = self._add_file(f"{batch_id}_errors.jsonl", 'batch_output',
+                                        ''.join(json.dumps(r) + '\n' for r in errors).encode('utf-8'))
+        with self.lock:
+            batch.update(
+                status='completed',
+                completed_at=int(time.time()),
+                output_file_id=output_file['id'],
+                error_file_id=error_file['id'] if error_file else None,
+                request_counts={'total': len(outputs) + len(errors), 'completed': len(outputs), 'failed': len(errors)},
+            )
+
+
+def completion(request: Dict) -> Dict:
+    """OpenAI chat.completion object answering a chat request"""
+    prompt = request.get('messages', [{}])[-1].get('content', '')
+    if (request.get('response_format') or {}).get('type') == 'json_object':
+        post = fake_packed_posts(prompt)
+    else:
+        post = fake_post(prompt)
+    return {
+        'id': f"chatcmpl-{hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:12]}",
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': request.get('model', 'gpt-3.5-turbo'),
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': post},
+            'finish_reason': 'stop',
+        }],
+        'usage': {
+            'prompt_tokens': len(prompt) // 4,
+            'completion_tokens': len(post) // 4,
+            'total_tokens': (len(prompt) + len(post)) // 4,
+        },
+    }
+
+
+def fake_post(prompt: str) -> str:
+    """Deterministic LinkedIn-style post for a prompt"""
+    title = next((line[7:] for line in prompt.splitlines() if line.startswith('Title: ')), 'this article')
+    url = next((line[5:] for line in prompt.splitlines() if line.startswith('URL: ')), '')
+    return (f"🚀 {title}\n\n"
+            f"1️⃣ First takeaway\n2️⃣ Second takeaway\n3️⃣ Third takeaway\n\n"
+            f"Read more: {url}\n\n#Benchmark #Testing")
+
+
+def fake_packed_posts(prompt: str) -> str:
+    """JSON answer to a packed prompt: one post per "[id]" article block"""
+    blocks = re.findall(r'^\[(\d+)\]\n(Title: .*\nURL: .*)$', prompt, flags=re.MULTILINE)
+    return json.dumps({'posts': [{'id': int(article_id), 'post': fake_post(block)} for article_id, block in blocks]})
+
+
+class ReplayAdapter(BaseAdapter):
+    """requests adapter that sends blog-host requests to the fake server instead"""
+    
+    def __init__(self, server_url: str, inner: BaseAdapter):
+        super().__init__()
+        self.server_url = server_url
+        self.inner = inner
+    
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        query = f"?{parts.query}" if parts.query else ''
+        request.url = f"{self.server_url}/{parts.netloc}{parts.path}{query}"
+        return self.inner.send(request, **kwargs)
+    
+    def close(self):
+        self.inner.close()
+
+
+def install_replay(client, server: FakeServer):
+    """
+    Route an HTTPClient's requests for the three blogs to the fake server
+    
+    Only the HTTP/1.1 (requests) backend is supported.
+    """
+    if not isinstance(client.session, requests.Session):
+        raise RuntimeError("Replay requires the HTTP/1.1 client (set HTTP2=false)")
+    
+    inner = client.session.get_adapter('http://')
+    for index_url in INDEX_URLS.values():
+        parts = urlsplit(index_url)
+        client.session.mount(f"{parts.scheme}://{parts.netloc}/", ReplayAdapter(server.url, inner))
@@ -0,0 +1,250 @@
+"""
+Benchmark Fixtures - Saved blog pages replayed by the benchmarks
+
+Recorded pages live in benchmarks/fixtures/ (see `python3 -m benchmarks.fixtures --record`).
+When no recording exists, deterministic synthetic pages shaped like each blog are used.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Dict, List
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures'
+MANIFEST = FIXTURE_DIR / 'manifest.json'
+
+INDEX_URLS = {
+    'Fullstack': 'https://www.fullstack.com/labs/resources/blog',
+    'Docker': 'https://www.docker.com/blog/',
+    'AWS DevOps': 'https://aws.amazon.com/blogs/devops/',
+}
+
+# Synthetic archive depth per source (pages past it are empty)
+ARCHIVE_PAGES = 5
+
+# Synthetic feeds: RSS for Docker, Atom for AWS DevOps; Fullstack has none
+FEED_URLS = {
+    'Docker': 'https://www.docker.com/blog/feed/',
+    'AWS DevOps': 'https://aws.amazon.com/blogs/devops/feed/',
+}
+FEED_PAGE_SIZE = 10
+
+WORDS = (
+    "container kubernetes pipeline deploy cloud service latency scaling build image "
+    "registry cluster observability developer security release workflow automation "
+    "serverless database cache network platform testing monitoring runtime compose"
+).split()
+
+
+def load_manifest() -> Dict[str, str]:
+    """Recorded URL -> fixture file name"""
+    if not MANIFEST.exists():
+        return {}
+    with open(MANIFEST, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_page(url: str) -> bytes:
+    """Recorded copy of a page, or a synthetic one when it was never recorded"""
+    filename = load_manifest().get(url)
+    if filename and (FIXTURE_DIR / filename).exists():
+        return (FIXTURE_DIR / filename).read_bytes()
+    
+    for source, feed_url in FEED_URLS.items():
+        match = re.fullmatch(re.escape(feed_url) + r'(?:\?paged=(\d+))?', url)
+        if match:
+            return synthetic_feed(source, page=int(match.group(1) or 1))
+    
+    for source, index_url in INDEX_URLS.items():
+        if url == index_url:
+            return synthetic_index(source)
+        
+        # Archive pages: .../page/N/ (Docker, AWS) or ...?page=N (Fullstack)
+        if url.startswith(index_url.rstrip('/')):
+            match = re.fullmatch(r'/page/(\d+)/?|\?page=(\d+)', url[len(index_url.rstrip('/')):])
+            if match:
+                return synthetic_index(source, page=int(match.group(1) or match.group(2)))
+    return synthetic_article(url)
+
+
+def index_pages() -> Dict[str, bytes]:
+    """Index page per source"""
+    return {source: load_page(url) for source, url in INDEX_URLS.items()}
+
+
+def article_urls(limit: int = 10) -> List[str]:
+    """Article URLs linked from the (recorded or synthetic) index pages"""
+    recorded = [url for url in load_manifest() if url not in INDEX_URLS.values()]
+    if recorded:
+        return recorded[:limit]
+    
+    urls = []
+    for source in INDEX_URLS:
+        urls.extend(_synthetic_urls(source)[:max(1, limit // len(INDEX_URLS))])
+    return urls[:limit]
+
+
+def _rng(seed: str) -> random.Random:
+    return random.Random(int(hashlib.sha256(seed.encode('utf-8')).hexdigest()[:16], 16))
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _boilerplate(rng: random.Random) -> str:
+    """Inline scripts, styles and navigation typical of the real pages"""
+    script = ''.join(f"window.__data_{i}={{id:{i},v:'{_sentence(rng, 12)}'}};" for i in range(400))
+    style = ''.join(f".c{i}{{margin:{i % 9}px;color:#{i:06x}}}" for i in range(600))
+    nav = ''.join(f'<li><a href="/nav/{i}">{_sentence(rng, 2)}</a></li>' for i in range(40))
+    return (f"<head><title>Blog</title><style>{style}</style><script>{script}</script></head>"
+            f"<header><nav><ul>{nav}</ul></nav></header>")
+
+
+def _footer(rng: random.Random) -> str:
+    links = ''.join(f'<a href="/legal/{i}">{_sentence(rng, 2)}</a>' for i in range(30))
+    return f"<footer>{links}<script>{_sentence(rng, 200)}</script></footer>"
+
+
+def _synthetic_urls(source: str, page: int = 1) -> List[str]:
+    base = {
+        'Fullstack': 'https://www.fullstack.com/labs/resources/blog/',
+        'Docker': 'https://www.docker.com/blog/',
+        'AWS DevOps': 'https://aws.amazon.com/blogs/devops/',
+    }[source]
+    rng = _rng(source if page == 1 else f"{source}:{page}")
+    start = (page - 1) * 60
+    return [f"{base}{'-'.join(rng.choice(WORDS) for _ in range(5))}-{i}/" for i in range(start, start + 60)]
+
+
+def _next_page_link(source: str, page: int) -> str:
+    """Pagination link below the cards, in the style of the given blog"""
+    if page >= ARCHIVE_PAGES:
+        return ""
+    if source == 'Fullstack':
+        return f'<a rel="next" href="/labs/resources/blog?page={page + 1}">Next</a>'
+    return f'<a class="next page-numbers" href="{INDEX_URLS[source]}page/{page + 1}/">Older posts</a>'
+
+
+def synthetic_index(source: str, page: int = 1) -> bytes:
+    """
+    Index page with 60 article links in the markup style of the given blog
+    
+    Pages 2 to ARCHIVE_PAGES are older archive pages (AWS dates go back a
+    month per page); later pages have no articles.
+    """
+    rng = _rng(f"index:{source}" if page == 1 else f"index:{source}:{page}")
+    month = _month(page)
+    cards = []
+    
+    for url in (_synthetic_urls(source, page) if page <= ARCHIVE_PAGES else []):
+        title = _sentence(rng, 8)
+        if source == 'AWS DevOps':
+            cards.append(
+                f'<article class="blog-post"><h2 class="blog-post-title"><a href="{url}">{title}</a></h2>'
+                f'<footer class="blog-post-meta">by <span>Author</span> on '
+                f'<time datetime="{month}-{rng.randint(1, 28):02d}">{month}</time></footer>'
+                f'<section class="blog-post-excerpt"><p>{_sentence(rng, 40)}</p></section></article>'
+            )
+        elif source == 'Fullstack':
+            path = url.replace('https://www.fullstack.com', '')
+            cards.append(f'<div class="card"><a href="{path}"><h3>{title}</h3></a><p>{_sentence(rng, 25)}</p></div>')
+        else:
+            cards.append(f'<div class="post"><a href="{url}">{title}</a><p>{_sentence(rng, 25)}</p></div>')
+    
+    html = (f"<!DOCTYPE html><html>{_boilerplate(rng)}<body><main>{''.join(cards)}</main>"
+            f"{_next_page_link(source, page)}{_footer(rng)}</body></html>")
+    return html.encode('utf-8')
+
+
+def _month(page: int) -> str:
+    months = 2024 * 12 - (page - 1)  # January 2024 for archive page 1, then a month earlier per page
+    return f"{months // 12}-{months % 12 + 1:02d}"
+
+
+def synthetic_feed(source: str, page: int = 1) -> bytes:
+    """Feed page with FEED_PAGE_SIZE entries linking the same articles as the archive pages"""
+    rng = _rng(f"feed:{source}:{page}")
+    first = (page - 1) * FEED_PAGE_SIZE
+    entries = []
+    
+    for position in range(first, first + FEED_PAGE_SIZE):
+        archive_page, offset = divmod(position, 60)
+        if archive_page >= ARCHIVE_PAGES:
+            break
+        url = _synthetic_urls(source, archive_page + 1)[offset]
+        title = _sentence(rng, 8)
+        day = f"{_month(archive_page + 1)}-{28 - offset * 27 // 60:02d}"
+        summary = ''.join(f"&lt;p&gt;{_sentence(rng, 30)}&lt;/p&gt;" for _ in range(3))
+        if source == 'AWS DevOps':
+            entries.append(f'<entry><title>{title}</title><link rel="alternate" href="{url}"/>'
+                           f'<id>{url}</id><published>{day}T10:00:00Z</published>'
+                           f'<summary type="html">{summary}</summary></entry>')
+        else:
+            entries.append(f'<item><title>{title}</title><link>{url}</link><guid>{url}</guid>'
+                           f'<pubDate>{format_datetime(datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc))}</pubDate>'
+                           f'<description>{summary}</description></item>')
+    
+    if source == 'AWS DevOps':
+        xml = (f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+               f'<title>{source}</title>{"".join(entries)}</feed>')
+    else:
+        xml = (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+               f'<title>{source}</title>{"".join(entries)}</channel></rss>')
+    return xml.encode('utf-8')
+
+
+def synthetic_article(url: str) -> bytes:
+    """Article page: heavy head, navigation, ~40 paragraphs of body text"""
+    rng = _rng(f"article:{url}")
+    paragraphs = ''.join(
+        (f"<h2>{_sentence(rng, 5)}</h2>" if i % 8 == 0 else "") + f"<p>{_sentence(rng, 60)}</p>"
+        for i in range(40)
+    )
+    html = (f"<!DOCTYPE html><html>{_boilerplate(rng)}<body>"
+            f"<aside>{_sentence(rng, 50)}</aside>"
+            f"<article><h1>{_sentence(rng, 8)}</h1>{paragraphs}</article>"
+            f"{_footer(rng)}</body></html>")
+    return html.encode('utf-8')
+
+
+def record(articles_per_source: int = 5):
+    """Download the live index pages and a few articles into benchmarks/fixtures/"""
+    from crawlers import AWSCrawler, DockerCrawler, FullstackCrawler, get_client
+    
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    client = get_client()
+    
+    def save(url: str):
+        response = client.get(url, timeout=15)
+        response.raise_for_status()
+        filename = f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.html"
+        (FIXTURE_DIR / filename).write_bytes(response.content)
+        manifest[url] = filename
+        print(f"  ✓ {url} ({len(response.content) / 1024:.0f} KB)")
+    
+    for crawler in (FullstackCrawler(), DockerCrawler(), AWSCrawler()):
+        save(crawler.URL)
+        for article in crawler.crawl(limit=articles_per_source):
+            save(article['url'])
+    
+    with open(MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"✓ Recorded {len(manifest)} pages to {FIXTURE_DIR}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage benchmark page fixtures")
+    parser.add_argument('--record', action='store_true', help="download live pages into benchmarks/fixtures/")
+    parser.add_argument('--articles', type=int, default=5, help="articles recorded per source")
+    args = parser.parse_args()
+    
+    if args.record:
+        record(args.articles)
+    else:
+        parser.print_help()
@@ -0,0 +1,138 @@
+"""
+Parser Benchmark - Compare HTML parser backends on saved blog pages
+
+With --workers, also measures article extraction throughput through the
+process pool (PARSE_WORKERS) for each worker count, 0 being the
+in-thread baseline.
+
+Usage:
+    python3 -m benchmarks.parser_benchmark [--repeat N] [--workers 0 1 2 4] [--json]
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from crawlers.parse_pool import configure_parse_pool, parse_in_pool
+from crawlers.parsing import BACKENDS, CONTENT_SELECTORS, extract_blocks, parse_html, set_parser_backend
+from crawlers.registry import CRAWLERS
+from crawlers.url_dedupe import normalize_url
+from benchmarks.fixtures import INDEX_URLS, article_urls, index_pages, load_page
+from prompt_budget import get_budget
+
+
+def time_per_call(func: Callable, repeat: int) -> float:
+    """Best-of-three average seconds per call"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def run(repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Time index parsing and content extraction for every installed backend
+    
+    Index pages are parsed whole and with their crawler's PARSE_ONLY
+    strainer. selectolax has no BeautifulSoup builder (index pages go
+    through lxml), so only its article excerpt is timed.
+    
+    Returns:
+        {backend: {measurement: milliseconds per page}}
+    """
+    indexes = index_pages()
+    articles = [load_page(url) for url in article_urls(limit=6)]
+    strainers = {source: CRAWLERS[normalize_url(url)].PARSE_ONLY for source, url in INDEX_URLS.items()}
+    results = {}
+    
+    for backend in BACKENDS:
+        if set_parser_backend(backend) != backend:
+            continue
+        
+        timings = {}
+        for source, page in indexes.items():
+            if backend == 'selectolax':
+                break
+            timings[f"{source} index (full tree)"] = time_per_call(lambda: parse_html(page), repeat)
+            timings[f"{source} index (PARSE_ONLY)"] = time_per_call(
+                lambda: parse_html(page, parse_only=strainers[source]), repeat
+            )
+        # What the extract stage does per page: main-content blocks cut to the content budget
+        timings["article excerpt"] = time_per_call(
+            lambda: [get_budget().excerpt(extract_blocks(page)) for page in articles], repeat
+        ) / len(articles)
+        
+        results[backend] = {name: seconds * 1000 for name, seconds in timings.items()}
+    
+    set_parser_backend('html.parser')
+    return results
+
+
+def pool_scaling(workers: List[int], pages: int = 120) -> Dict[int, float]:
+    """
+    Extraction throughput (fixture article pages per second) for each worker count
+    
+    Pages are handed over by 8 threads, like the extraction stage's fetch
+    workers. Worker processes are started before timing.
+    """
+    articles = [load_page(url) for url in article_urls(limit=6)]
+    batch = [articles[i % len(articles)] for i in range(pages)]
+    results = {}
+    
+    for count in workers:
+        configure_parse_pool(count)
+        if count:
+            extract = lambda page: parse_in_pool(page, CONTENT_SELECTORS)
+            # Start every worker process before timing
+            with ThreadPoolExecutor(max_workers=count) as executor:
+                list(executor.map(extract, articles[:1] * count))
+        else:
+            extract = lambda page: get_budget().excerpt(extract_blocks(page, CONTENT_SELECTORS))
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(extract, batch))
+        results[count] = pages / (time.perf_counter() - start)
+    
+    configure_parse_pool(0)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends")
+    parser.add_argument('--repeat', type=int, default=5, help="calls per timing run")
+    parser.add_argument('--workers', type=int, nargs='+', help="also time the parse pool with these PARSE_WORKERS values")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+    
+    results = run(args.repeat)
+    scaling = pool_scaling(args.workers) if args.workers else None
+    
+    if args.json:
+        if scaling:
+            results = {'backends': results, 'parse_pool_pages_per_s': scaling}
+        print(json.dumps(results, indent=2))
+        return
+    
+    baseline = results.get('html.parser', {})
+    for backend, timings in results.items():
+        print(f"\n{backend}")
+        for name, ms in timings.items():
+            speedup = baseline[name] / ms if baseline.get(name) else 1.0
+            print(f"  {name:<36} {ms:8.2f} ms  ({speedup:.1f}x)")
+    
+    if scaling:
+        print(f"\nparse pool, html.parser ({os.cpu_count()} CPUs)")
+        baseline = scaling.get(0) or next(iter(scaling.values()))
+        for count, rate in scaling.items():
+            label = f"{count} processes" if count else "in-thread"
+            print(f"  {label:<36} {rate:8.1f} pages/s  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
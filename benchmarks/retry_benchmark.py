@@ -0,0 +1,148 @@
+"""
+Retry Benchmark - Exercise AsyncPostGenerator's retry, timeout and streaming paths offline
+
+Each scenario scripts the fake chat-completions API (rate limits with
+Retry-After, server errors, stalled responses, bad requests), generates a
+few posts and checks the outcome: posts returned, GenerationError details,
+retries made and time spent backing off. The exit status is 1 if any
+scenario does not behave as expected.
+
+Usage:
+    python3 -m benchmarks.retry_benchmark [--articles 8] [--llm-latency 0.05] [--json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from typing import Dict, List
+
+from async_generator import AsyncPostGenerator, GenerationError
+from benchmarks.fake_server import FakeServer
+from metrics import METRICS, percentile
+
+# name -> fake server settings, generator settings and the expected outcome
+SCENARIOS = {
+    'ok': {
+        'server': {}, 'generator': {},
+        'expect': {'posts': 1.0, 'retries_per_post': 0},
+    },
+    'rate_limited': {
+        'server': {'faults': [429], 'retry_after': '0.3'}, 'generator': {},
+        'expect': {'posts': 1.0, 'retries_per_post': 1, 'min_seconds': 0.3},
+    },
+    'server_errors': {
+        'server': {'faults': [500, 503]}, 'generator': {},
+        'expect': {'posts': 1.0, 'retries_per_post': 2},
+    },
+    'timeout': {
+        'server': {'faults': ['stall'], 'stall': 2.0}, 'generator': {'timeout': 0.5},
+        'expect': {'posts': 1.0, 'retries_per_post': 1},
+    },
+    'retries_exhausted': {
+        'server': {'faults': [502] * 5}, 'generator': {'max_retries': 2},
+        'expect': {'posts': 0.0, 'status': 502, 'attempts': 3},
+    },
+    'bad_request': {
+        'server': {'faults': [400]}, 'generator': {},
+        'expect': {'posts': 0.0, 'status': 400, 'attempts': 1, 'retries_per_post': 0},
+    },
+    'streaming': {
+        'server': {}, 'generator': {'stream': True},
+        'expect': {'posts': 1.0, 'retries_per_post': 0, 'first_token': True},
+    },
+}
+
+
+def run_scenario(name: str, articles: int, llm_latency: float, concurrency: int) -> Dict:
+    """Generate `articles` posts under one scenario and check them against its expectations"""
+    scenario = SCENARIOS[name]
+    server = FakeServer(llm_latency=llm_latency, **scenario['server']).start()
+    METRICS.reset()
+    try:
+        generator = AsyncPostGenerator('benchmark', base_url=f"{server.url}/v1", backoff_base=0.05,
+                                       backoff_max=0.5, **scenario['generator'])
+        items = [({'title': f"Retry scenario {name} article {i}", 'url': f"https://example.com/{name}/{i}"},
+                  "content " * 50) for i in range(articles)]
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            outputs = generator.run(generator.generate_all(items, concurrency=concurrency))
+            seconds = time.perf_counter() - start
+        generator.close()
+    finally:
+        server.stop()
+    
+    errors = [output for output in outputs if isinstance(output, GenerationError)]
+    first_tokens = [seconds for stage, _, _, seconds in METRICS.records if stage == 'llm_first_token']
+    result = {
+        'posts': len(outputs) - len(errors),
+        'errors': len(errors),
+        'retries': generator.retries,
+        'seconds': round(seconds, 3),
+        'error': str(errors[0]) if errors else None,
+        'first_token_p50_ms': round(percentile(first_tokens, 0.5) * 1000, 1) if first_tokens else None,
+        'server': dict(server.counts),
+    }
+    result['problems'] = check(scenario['expect'], result, errors, articles, llm_latency)
+    return result
+
+
+def check(expect: Dict, result: Dict, errors: List[GenerationError], articles: int, llm_latency: float) -> List[str]:
+    """Differences between a scenario's result and its expectations"""
+    problems = []
+    if result['posts'] != int(expect['posts'] * articles):
+        problems.append(f"expected {int(expect['posts'] * articles)} posts, got {result['posts']}")
+    if 'retries_per_post' in expect and result['retries'] != expect['retries_per_post'] * articles:
+        problems.append(f"expected {expect['retries_per_post'] * articles} retries, got {result['retries']}")
+    if 'min_seconds' in expect and result['seconds'] < expect['min_seconds']:
+        problems.append(f"finished in {result['seconds']}s, before Retry-After ({expect['min_seconds']}s)")
+    for error in errors:
+        if 'status' in expect and error.status != expect['status']:
+            problems.append(f"expected HTTP {expect['status']}, got {error.status}")
+            break
+        if 'attempts' in expect and error.attempts != expect['attempts']:
+            problems.append(f"expected {expect['attempts']} attempts, got {error.attempts}")
+            break
+    if expect.get('first_token'):
+        if result['first_token_p50_ms'] is None:
+            problems.append("no first-token latency recorded")
+        elif result['first_token_p50_ms'] >= llm_latency * 1000:
+            problems.append(f"first token after {result['first_token_p50_ms']} ms, not before the full answer")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline checks of async generation retry paths")
+    parser.add_argument('--articles', type=int, default=8, help="posts generated per scenario")
+    parser.add_argument('--llm-latency', type=float, default=0.05, help="fake chat-completion latency in seconds")
+    parser.add_argument('--concurrency', type=int, default=4, help="requests in flight at once")
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS), help="run only these scenarios")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+    
+    results = {
+        name: run_scenario(name, args.articles, args.llm_latency, args.concurrency)
+        for name in args.scenario or SCENARIOS
+    }
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            status = '✓' if not result['problems'] else '✗'
+            first_token = f", first token p50 {result['first_token_p50_ms']} ms" if result['first_token_p50_ms'] else ''
+            print(f"{status} {name:<18} {result['posts']} posts, {result['errors']} errors, "
+                  f"{result['retries']} retries, {result['seconds']:.2f}s{first_token}")
+            if result['error']:
+                print(f"    error: {result['error']}")
+            for problem in result['problems']:
+                print(f"    ✗ {problem}")
+    
+    if any(result['problems'] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Run Benchmark - Offline end-to-end timing of crawling, extraction and generation
+
+Replays recorded (or synthetic) blog pages and a fake chat-completions API
+from a local server, so runs are repeatable and cost nothing.
+
+Usage:
+    python3 -m benchmarks.run_benchmark [--llm-latency 0.5] [--error-rate 0.0]
+                                        [--articles 10] [--batch | --async [--stream]]
+                                        [--output results.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from benchmarks.fake_server import FakeServer, install_replay
+from benchmarks.fixtures import article_urls
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds"""
+    ordered = sorted(samples)
+    p95_index = max(0, int(round(0.95 * len(ordered))) - 1)
+    return {
+        'count': len(ordered),
+        'mean_ms': statistics.mean(ordered) * 1000,
+        'p50_ms': statistics.median(ordered) * 1000,
+        'p95_ms': ordered[p95_index] * 1000,
+        'max_ms': ordered[-1] * 1000,
+    }
+
+
+def timed(func: Callable, repeat: int = 1) -> List[float]:
+    """Seconds taken by each of `repeat` calls (console output suppressed)"""
+    samples = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def configure_environment(server: FakeServer, workdir: str, args):
+    """Point the app at the fake server and keep every cache/output inside workdir"""
+    os.environ.update({
+        'OPENAI_API_KEY': 'benchmark',
+        'OPENAI_BASE_URL': f"{server.url}/v1",
+        'MAX_ARTICLES_PER_URL': str(args.articles),
+        'EXTRACT_CONTENT': 'true' if args.extract else 'false',
+        'OUTPUT_FILE': os.path.join(workdir, 'output', 'linkedin_posts.txt'),
+        'POST_LOG_FILE': os.path.join(workdir, 'output', 'linkedin_posts.jsonl'),
+        'HTTP2': 'false',
+        'HTTP_CACHE': 'false',
+        'GENERATION_CACHE': 'false',
+        'SEEN_INDEX': 'false',
+        'OPENAI_RPM': '0',
+        'OPENAI_TPM': '0',
+        'GENERATION_MODE': 'batch' if args.batch else 'async' if args.async_mode else 'sync',
+        'OPENAI_STREAM': 'true' if args.stream else 'false',
+        'PACK_SIZE': str(args.pack_size),
+        'BATCH_POLL_INTERVAL': '0.1',
+        'CRAWL_PAGES': str(args.pages),
+        'PARSE_WORKERS': str(args.parse_workers),
+    })
+
+
+def run(args) -> Dict:
+    """Run every benchmark and return the JSON-serializable results"""
+    from crawlers import AWSCrawler, DockerCrawler, FullstackCrawler, configure_client, configure_parse_pool
+    from main import LinkedInPostApp
+    from metrics import METRICS
+    from async_generator import AsyncPostGenerator
+    from post_generator import PostGenerator
+    
+    server = FakeServer(llm_latency=args.llm_latency, error_rate=args.error_rate,
+                        batch_latency=args.batch_latency).start()
+    workdir = tempfile.mkdtemp(prefix='linkedin-bench-')
+    previous_cwd = os.getcwd()
+    results = {}
+    
+    try:
+        configure_environment(server, workdir, args)
+        
+        # crawl(): index fetch + parse per source
+        client = configure_client()
+        install_replay(client, server)
+        configure_parse_pool(args.parse_workers)
+        crawlers = {'Fullstack': FullstackCrawler(), 'Docker': DockerCrawler(), 'AWS DevOps': AWSCrawler()}
+        results['crawl'] = {
+            source: summarize(timed(lambda: crawler.crawl(limit=args.articles, pages=args.pages), args.repeat))
+            for source, crawler in crawlers.items()
+        }
+        
+        # extract_content(): article fetch + main-content extraction
+        urls = article_urls(limit=args.articles)
+        extract_samples = []
+        for url in urls:
+            crawler = next((c for c in crawlers.values() if url.startswith(c.URL.rstrip('/'))), crawlers['Docker'])
+            extract_samples.extend(timed(lambda: crawler.extract_content(url), args.repeat))
+        results['extract_content'] = summarize(extract_samples)
+        results['http'] = {'requests': client.stats.requests, 'connections_opened': client.stats.opened}
+        configure_parse_pool(0)
+        
+        # PostGenerator.generate(): one chat completion per article
+        generator = PostGenerator('benchmark', base_url=f"{server.url}/v1")
+        article = {'title': 'Benchmarking LinkedIn post generation offline', 'url': urls[0]}
+        results['generate'] = summarize(timed(lambda: generator.generate(article, "content " * 100), args.repeat))
+        
+        if args.async_mode:
+            # AsyncPostGenerator.generate_async(): same request on AsyncOpenAI, retrying injected errors
+            async_generator = AsyncPostGenerator('benchmark', base_url=f"{server.url}/v1", stream=args.stream,
+                                                 backoff_base=0.1)
+            results['generate_async'] = summarize(timed(
+                lambda: async_generator.run(async_generator.generate_all([(article, "content " * 100)])), args.repeat
+            ))
+            results['generate_async']['retries'] = async_generator.retries
+            results['generate_async']['failed'] = async_generator.failures
+            async_generator.close()
+        
+        items = [({'title': f"Benchmark article {i}", 'url': url}, "content " * 100) for i, url in enumerate(urls)]
+        if args.pack_size > 1:
+            # PostGenerator.generate_packed(): PACK_SIZE articles per request
+            packs = [items[i:i + args.pack_size] for i in range(0, len(items), args.pack_size)]
+            results['generate_packed'] = summarize(timed(
+                lambda: [generator.generate_packed(pack) for pack in packs], args.repeat
+            ))
+        
+        if args.batch:
+            # PostGenerator.generate_batch(): every article in one Batch API job
+            results['generate_batch'] = summarize(timed(
+                lambda: generator.generate_batch(items, poll_interval=0.1), args.repeat
+            ))
+        
+        # LinkedInPostApp.run(): the whole workflow end to end
+        os.chdir(workdir)  # meta.txt is written relative to the working directory
+        app_samples = []
+        for _ in range(args.repeat):
+            def run_app():
+                app = LinkedInPostApp()
+                install_replay(app.http_client, server)
+                app.run()
+            app_samples.extend(timed(run_app))
+        results['app_run'] = summarize(app_samples)
+        results['app_stages'] = METRICS.summary()  # Spans from the last run
+    finally:
+        os.chdir(previous_cwd)
+        server.stop()
+    
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'settings': {
+            'articles_per_source': args.articles,
+            'extract_content': args.extract,
+            'llm_latency_s': args.llm_latency,
+            'error_rate': args.error_rate,
+            'pack_size': args.pack_size,
+            'pages': args.pages,
+            'parse_workers': args.parse_workers,
+            'batch': args.batch,
+            'async': args.async_mode,
+            'stream': args.stream,
+            'batch_latency_s': args.batch_latency,
+            'repeat': args.repeat,
+        },
+        'server': dict(server.counts),
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the LinkedIn post generator")
+    parser.add_argument('--articles', type=int, default=10, help="MAX_ARTICLES_PER_URL for the run")
+    parser.add_argument('--no-extract', dest='extract', action='store_false', help="skip content extraction")
+    parser.add_argument('--llm-latency', type=float, default=0.5, help="fake chat-completion latency in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of completions failing with 429/500")
+    parser.add_argument('--pack-size', type=int, default=1, help="articles per chat completion (PACK_SIZE)")
+    parser.add_argument('--batch', action='store_true', help="generate through the (fake) Batch API")
+    parser.add_argument('--async', dest='async_mode', action='store_true',
+                        help="generate on AsyncOpenAI with retries (GENERATION_MODE=async)")
+    parser.add_argument('--stream', action='store_true', help="stream async completions (OPENAI_STREAM)")
+    parser.add_argument('--batch-latency', type=float, default=1.0, help="seconds until a fake batch completes")
+    parser.add_argument('--pages', type=int, default=1, help="index pages read per source (CRAWL_PAGES)")
+    parser.add_argument('--parse-workers', type=int, default=0, help="processes parsing article pages (PARSE_WORKERS)")
+    parser.add_argument('--repeat', type=int, default=3, help="repetitions per measurement")
+    parser.add_argument('--output', help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args()
+    if args.async_mode and args.pack_size > 1:
+        parser.error("--async cannot be combined with --pack-size above 1 (GENERATION_MODE=async needs PACK_SIZE=1)")
+    
+    report = json.dumps(run(args), indent=2)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f"✓ Saved benchmark results to {args.output}")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
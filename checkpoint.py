@@ -0,0 +1,175 @@
+"""
+Checkpoint - Crash-safe progress file for resuming interrupted runs
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class Checkpoint:
+    """
+    Record the articles of a run, their extracted content and which are finished
+    
+    The checkpoint is a snapshot, rewritten atomically (temp file + rename),
+    plus a JSON-lines journal next to it. Finished articles, extracted
+    content and articles found while crawling are appended to the journal,
+    so the cost per article does not grow with the run; save() folds the
+    journal into a new snapshot. Post texts themselves live in the JSONL
+    post log.
+    """
+    
+    def __init__(self, path: str = '.cache/checkpoint.json'):
+        """
+        Initialize the checkpoint (nothing is read or written yet)
+        
+        Args:
+            path: JSON file holding the checkpoint snapshot (the journal is path + '.journal')
+        """
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.lock = threading.Lock()
+        self.state = None
+    
+    def start(self, articles: List[Dict]):
+        """Begin a new run over the given (already selected) articles"""
+        with self.lock:
+            self.state = {
+                'started_at': datetime.now().isoformat(),
+                'articles': articles,
+                'content': {},
+                'done': [],
+            }
+            self._save()
+    
+    def add(self, articles: List[Dict]):
+        """Append articles discovered while the run is already going (paged crawls)"""
+        with self.lock:
+            self.state['articles'].extend(articles)
+            self._append({'articles': articles})
+    
+    def load(self) -> bool:
+        """
+        Load the checkpoint of an interrupted run
+        
+        Returns:
+            True if a checkpoint was found
+        """
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Ignoring unreadable checkpoint {self.path}: {e}")
+            return False
+        replayed = self._replay(state)
+        
+        with self.lock:
+            self.state = state
+            if replayed:
+                self._save()  # New entries go to a fresh journal, not after a possibly torn last line
+        return True
+    
+    @property
+    def started_at(self) -> str:
+        return self.state['started_at']
+    
+    @property
+    def articles(self) -> List[Dict]:
+        return self.state['articles']
+    
+    def done(self) -> set:
+        """URLs of finished articles (posted or skipped)"""
+        with self.lock:
+            return set(self.state['done'])
+    
+    @property
+    def batch(self) -> Optional[Dict]:
+        """Batch API job submitted by this run and not collected yet ({'id', 'input_file_id', 'custom_ids'})"""
+        with self.lock:
+            return self.state.get('batch')
+    
+    def save_batch(self, batch: Optional[Dict]):
+        """Record a submitted batch (None once its results are read) and write the checkpoint"""
+        with self.lock:
+            self.state['batch'] = batch
+            self._save()
+    
+    def content(self, url: str) -> Optional[str]:
+        """Extracted content saved for an article, or None if it was not extracted yet"""
+        with self.lock:
+            return self.state['content'].get(url)
+    
+    def save_content(self, url: str, content: str):
+        """Keep extracted content so a resumed run does not fetch it again (synced with the next finished article)"""
+        with self.lock:
+            self.state['content'][url] = content
+            self._append({'content': [url, content]}, sync=False)
+    
+    def finish(self, url: str):
+        """Mark an article finished and append it to the journal"""
+        with self.lock:
+            self.state['done'].append(url)
+            self.state['content'].pop(url, None)  # Not needed once the article is finished
+            self._append({'done': url})
+    
+    def save(self):
+        """Write a snapshot of the checkpoint now and empty the journal (e.g. at the end of a run)"""
+        with self.lock:
+            self._save()
+    
+    def clear(self):
+        """Remove the checkpoint once a run has finished everything"""
+        with self.lock:
+            self.state = None
+            for path in (self.path, self.journal_path):
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    def _save(self):
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        # Everything in the journal is in the snapshot now (replaying it again would be harmless)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+    
+    def _append(self, entry: Dict, sync: bool = True):
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def _replay(self, state: Dict) -> bool:
+        """Apply the journal to a loaded snapshot (entries already in it are skipped); False if there is none"""
+        if not os.path.exists(self.journal_path):
+            return False
+        known = {article['url'] for article in state['articles']}
+        done = set(state['done'])
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # Cut off by a crash while appending
+                if 'articles' in entry:
+                    added = [article for article in entry['articles'] if article['url'] not in known]
+                    state['articles'].extend(added)
+                    known.update(article['url'] for article in added)
+                elif 'content' in entry:
+                    url, content = entry['content']
+                    if url not in done:
+                        state['content'][url] = content
+                elif entry['done'] not in done:
+                    state['done'].append(entry['done'])
+                    state['content'].pop(entry['done'], None)
+                    done.add(entry['done'])
+        return True
@@ -2,6 +2,7 @@
 Configuration Manager - Loads settings from .env file
 """
 import os
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -29,21 +30,232 @@ class Config:
         """Get OpenAI API key from environment"""
         return os.getenv('OPENAI_API_KEY')
     
+    @property
+    def openai_base_url(self) -> Optional[str]:
+        """Optional OpenAI-compatible endpoint (e.g. a proxy or local test server)"""
+        return os.getenv('OPENAI_BASE_URL') or None
+    
+    @property
+    def urls_file(self) -> str:
+        """Blog sources to crawl, one URL per line (.txt) or a JSON list (.json); relative to this project"""
+        path = Path(os.getenv('URLS_FILE', 'urls.txt'))
+        return str(path if path.is_absolute() else Path(__file__).parent / path)
+    
     @property
     def max_articles_per_url(self) -> int:
-        """Maximum articles to process per URL"""
+        """Maximum articles to process per URL (0 = no limit)"""
         return int(os.getenv('MAX_ARTICLES_PER_URL', '10'))
     
+    @property
+    def feed_first(self) -> bool:
+        """Discover articles through the blog's RSS/Atom feed, scraping the HTML index only as a fallback"""
+        return os.getenv('FEED_FIRST', 'true').lower() == 'true'
+    
+    @property
+    def feed_summaries(self) -> bool:
+        """With EXTRACT_CONTENT, use feed summaries as article content instead of fetching the article pages"""
+        return os.getenv('FEED_SUMMARIES', 'true').lower() == 'true'
+    
+    @property
+    def crawl_pages(self) -> int:
+        """Index and archive pages read per source (1 = landing page only, 0 = no limit)"""
+        return int(os.getenv('CRAWL_PAGES', '1'))
+    
+    @property
+    def crawl_since(self) -> Optional[str]:
+        """Skip articles published before this date (YYYY-MM-DD) and stop paging there"""
+        return os.getenv('CRAWL_SINCE') or None
+    
+    @property
+    def max_parallel_crawls(self) -> int:
+        """Maximum number of blog sources crawled at the same time"""
+        return int(os.getenv('MAX_PARALLEL_CRAWLS', '4'))
+    
+    @property
+    def max_requests_per_host(self) -> int:
+        """Maximum concurrent requests sent to a single host"""
+        return int(os.getenv('MAX_REQUESTS_PER_HOST', '2'))
+    
+    @property
+    def http_pool_size(self) -> int:
+        """Keep-alive connections pooled per host (in total with HTTP/2)"""
+        return int(os.getenv('HTTP_POOL_SIZE', '10'))
+    
+    @property
+    def http2(self) -> bool:
+        """Whether to use HTTP/2 for crawling (requires httpx[http2])"""
+        return os.getenv('HTTP2', 'false').lower() == 'true'
+    
+    @property
+    def http_cache(self) -> bool:
+        """Whether to cache pages on disk and revalidate them with conditional GETs"""
+        return os.getenv('HTTP_CACHE', 'true').lower() == 'true'
+    
+    @property
+    def http_cache_dir(self) -> str:
+        """Directory for the HTTP cache"""
+        return os.getenv('HTTP_CACHE_DIR', '.cache/http')
+    
+    @property
+    def http_cache_ttl(self) -> int:
+        """Seconds a cached page is reused without revalidation"""
+        return int(os.getenv('HTTP_CACHE_TTL', '900'))
+    
+    @property
+    def http_cache_max_mb(self) -> int:
+        """Maximum size of the HTTP cache in MB"""
+        return int(os.getenv('HTTP_CACHE_MAX_MB', '100'))
+    
+    @property
+    def html_parser(self) -> str:
+        """HTML parser backend: html.parser, lxml or selectolax"""
+        return os.getenv('HTML_PARSER', 'html.parser')
+    
     @property
     def extract_content(self) -> bool:
         """Whether to extract full article content"""
         return os.getenv('EXTRACT_CONTENT', 'false').lower() == 'true'
     
+    @property
+    def content_token_budget(self) -> int:
+        """Maximum tokens of extracted article content per prompt"""
+        return int(os.getenv('CONTENT_TOKEN_BUDGET', '150'))
+    
+    @property
+    def stream_extract(self) -> bool:
+        """Whether article pages are read incrementally and abandoned once the content budget is full"""
+        return os.getenv('STREAM_EXTRACT', 'true').lower() == 'true'
+    
+    @property
+    def stream_max_bytes(self) -> int:
+        """Stop reading an article page after this many bytes (0 = no cap)"""
+        return int(os.getenv('STREAM_MAX_BYTES', str(256 * 1024)))
+    
+    @property
+    def extract_workers(self) -> int:
+        """Number of concurrent content-extraction workers"""
+        return int(os.getenv('EXTRACT_WORKERS', '8'))
+    
+    @property
+    def parse_workers(self) -> int:
+        """Processes parsing fetched article pages (0 = parse in the extraction threads)"""
+        return int(os.getenv('PARSE_WORKERS', '0'))
+    
+    @property
+    def pipeline_queue_size(self) -> int:
+        """Capacity of the queue between extraction and generation"""
+        return int(os.getenv('PIPELINE_QUEUE_SIZE', '16'))
+    
+    @property
+    def dedupe(self) -> bool:
+        """Whether to generate one post per cluster of near-duplicate articles"""
+        return os.getenv('DEDUPE', 'true').lower() == 'true'
+    
+    @property
+    def dedupe_threshold(self) -> float:
+        """Estimated similarity of title and content (0-1) at which articles count as duplicates"""
+        return float(os.getenv('DEDUPE_THRESHOLD', '0.85'))
+    
+    @property
+    def max_concurrent_requests(self) -> int:
+        """Maximum number of OpenAI requests in flight at once"""
+        return int(os.getenv('MAX_CONCURRENT_REQUESTS', '4'))
+    
+    @property
+    def pack_size(self) -> int:
+        """Articles sent together in one chat completion (1 = one request per article)"""
+        return max(1, int(os.getenv('PACK_SIZE', '1')))
+    
+    @property
+    def generation_mode(self) -> str:
+        """'sync' (one chat completion per article), 'async' (same on AsyncOpenAI, with retries) or 'batch' (one OpenAI Batch API job per run)"""
+        return os.getenv('GENERATION_MODE', 'sync').lower()
+    
+    @property
+    def openai_timeout(self) -> float:
+        """Seconds one async chat completion may take before it is retried"""
+        return float(os.getenv('OPENAI_TIMEOUT', '60'))
+    
+    @property
+    def openai_max_retries(self) -> int:
+        """Retries of an async chat completion after rate limits, server errors and timeouts"""
+        return int(os.getenv('OPENAI_MAX_RETRIES', '4'))
+    
+    @property
+    def openai_stream(self) -> bool:
+        """Whether async chat completions stream tokens (records first-token latency)"""
+        return os.getenv('OPENAI_STREAM', 'false').lower() == 'true'
+    
+    @property
+    def batch_poll_interval(self) -> float:
+        """Seconds between status checks of a submitted batch"""
+        return float(os.getenv('BATCH_POLL_INTERVAL', '30'))
+    
+    @property
+    def openai_requests_per_minute(self) -> int:
+        """OpenAI requests-per-minute budget (0 = unlimited)"""
+        return int(os.getenv('OPENAI_RPM', '500'))
+    
+    @property
+    def openai_tokens_per_minute(self) -> int:
+        """OpenAI tokens-per-minute budget (0 = unlimited)"""
+        return int(os.getenv('OPENAI_TPM', '60000'))
+    
+    @property
+    def generation_cache(self) -> bool:
+        """Whether to reuse posts generated from identical prompts"""
+        return os.getenv('GENERATION_CACHE', 'true').lower() == 'true'
+    
+    @property
+    def generation_cache_path(self) -> str:
+        """SQLite file for the generation cache"""
+        return os.getenv('GENERATION_CACHE_PATH', '.cache/generations.db')
+    
+    @property
+    def generation_cache_max_age_days(self) -> int:
+        """Days before a cached post is evicted (0 = never)"""
+        return int(os.getenv('GENERATION_CACHE_MAX_AGE_DAYS', '30'))
+    
+    @property
+    def generation_cache_max_entries(self) -> int:
+        """Maximum number of cached posts (0 = unlimited)"""
+        return int(os.getenv('GENERATION_CACHE_MAX_ENTRIES', '5000'))
+    
+    @property
+    def seen_index(self) -> bool:
+        """Whether to skip articles that were already turned into posts"""
+        return os.getenv('SEEN_INDEX', 'true').lower() == 'true'
+    
+    @property
+    def seen_index_path(self) -> str:
+        """SQLite file recording posted article URLs"""
+        return os.getenv('SEEN_INDEX_PATH', '.cache/seen_articles.db')
+    
+    @property
+    def seen_check_content(self) -> bool:
+        """Whether already-posted articles are re-extracted to detect content changes"""
+        return os.getenv('SEEN_CHECK_CONTENT', 'false').lower() == 'true'
+    
     @property
     def output_file(self) -> str:
         """Output TXT filename"""
         return os.getenv('OUTPUT_FILE', 'output/linkedin_posts.txt')
     
+    @property
+    def post_log_file(self) -> str:
+        """Append-only JSONL log every post is written to as soon as it is generated"""
+        return os.getenv('POST_LOG_FILE', 'output/linkedin_posts.jsonl')
+    
+    @property
+    def checkpoint_file(self) -> str:
+        """Progress file rewritten after every finished article, read by --resume"""
+        return os.getenv('CHECKPOINT_FILE', '.cache/checkpoint.json')
+    
+    @property
+    def metrics_format(self) -> str:
+        """Stage timing export next to meta.txt: json, prometheus, both or none"""
+        return os.getenv('METRICS_FORMAT', 'json').lower()
+    
     @property
     def custom_hashtags(self) -> str:
         """Custom hashtags to append to posts"""
@@ -56,3 +268,11 @@ class Config:
             raise ValueError(
                 "OPENAI_API_KEY not found. Please create a .env file with your API key."
             )
+        if self.crawl_since:
+            try:
+                datetime.strptime(self.crawl_since, '%Y-%m-%d')
+            except ValueError:
+                raise ValueError(f"CRAWL_SINCE must be a date like 2024-01-31, got '{self.crawl_since}'") from None
+        if self.generation_mode == 'async' and self.pack_size > 1:
+            # Packed requests go through the sync client, without async mode's retries and error reporting
+            raise ValueError("PACK_SIZE must be 1 with GENERATION_MODE=async; use GENERATION_MODE=sync to pack requests")
@@ -1,8 +1,25 @@
 """
 Crawlers package - Blog-specific crawlers
 """
+from .base import BaseCrawler
 from .fullstack_crawler import FullstackCrawler
 from .docker_crawler import DockerCrawler
 from .aws_crawler import AWSCrawler
+from .generic_crawler import GenericCrawler
+from .feeds import configure_feeds
+from .http_cache import HTTPCache
+from .http_client import HTTPClient, configure_client, get_client
+from .parse_pool import configure_parse_pool, shutdown_parse_pool
+from .parsing import get_parser_backend, set_parser_backend
+from .registry import CrawlerRegistry, register
+from .streaming import configure_streaming
+from .url_dedupe import URLDeduper, clean_url, normalize_url
 
-__all__ = ['FullstackCrawler', 'DockerCrawler', 'AWSCrawler']
+__all__ = [
+    'BaseCrawler', 'FullstackCrawler', 'DockerCrawler', 'AWSCrawler', 'GenericCrawler',
+    'CrawlerRegistry', 'register',
+    'HTTPCache', 'HTTPClient', 'configure_client', 'get_client',
+    'get_parser_backend', 'set_parser_backend', 'configure_streaming', 'configure_feeds',
+    'configure_parse_pool', 'shutdown_parse_pool',
+    'URLDeduper', 'clean_url', 'normalize_url'
+]
@@ -0,0 +1,361 @@
+"""
+Base Crawler - Shared fetch, parse, filter and dedupe engine for blog crawlers
+"""
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from bs4 import SoupStrainer
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from metrics import span
+from prompt_budget import get_budget
+from .feeds import DATE_PATTERN, discover_feed, feeds_enabled, iter_feed
+from .http_client import get_client
+from .parse_pool import parse_in_pool, parse_pool_enabled
+from .parsing import CONTENT_SELECTORS, extract_blocks, parse_html
+from .streaming import stream_blocks, streaming_enabled
+from .url_dedupe import URLDeduper
+
+# Feed pages are handed to the XML parser in slices of this size, so it stops with the entries
+FEED_SLICE = 16 * 1024
+
+# Sent with every crawler request
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+def _site(host: str) -> str:
+    """Host without a leading www., so docker.com and www.docker.com match"""
+    host = host.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class BaseCrawler:
+    """
+    Crawl a blog index page and extract article content
+    
+    Subclasses declare the site; crawl() and extract_content() do the rest:
+        URL: Blog index page
+        SOURCE / HEADING: Source name in the output / log heading
+        ARTICLE_PATH: Path part every article link contains (link predicate)
+        CONTENT_SELECTORS: Main-content containers of article pages
+        PARSE_ONLY: Elements of the index page worth parsing (None = whole page)
+        PAGE_PATTERN: Archive page path relative to URL, e.g. 'page/{n}/'
+            (None = follow rel="next" links)
+        FEED_URL: RSS/Atom feed (None = look for one on the index page, '' = no feed)
+        FEED_PAGE_PATTERN: Older feed pages relative to FEED_URL, e.g. '?paged={n}'
+    Sites whose links need more than that override links() or is_article().
+    """
+    
+    URL = ''
+    SOURCE = ''
+    HEADING = ''
+    ARTICLE_PATH = '/'
+    CONTENT_SELECTORS = CONTENT_SELECTORS
+    PARSE_ONLY: Optional[SoupStrainer] = SoupStrainer(['a', 'link'], href=True)  # Links and <link rel="next">
+    PAGE_PATTERN: Optional[str] = None
+    FEED_URL: Optional[str] = None
+    FEED_PAGE_PATTERN: Optional[str] = None
+    MIN_TITLE_LENGTH = 15  # Shorter link texts are menus and "Read more" links
+    
+    headers = HEADERS
+    
+    def crawl(self, limit: Optional[int] = None, **options) -> List[Dict]:
+        """
+        Crawl the blog index and extract articles
+        
+        Args:
+            limit: Stop parsing once this many articles are collected (None = no limit)
+            **options: Paging options of crawl_pages (default: the landing page only)
+        
+        Returns:
+            List of dicts with 'url', 'title', and 'source' keys, plus 'published' and 'summary' when known
+        """
+        return [article for page in self.crawl_pages(limit, **options) for article in page]
+    
+    def crawl_pages(self, limit: Optional[int] = None, pages: int = 1, since: Optional[str] = None,
+                    known: Optional[Callable[[Dict], bool]] = None, workers: int = 2) -> Iterator[List[Dict]]:
+        """
+        Crawl the blog index and its archive pages, yielding each page's new articles as soon as it is parsed
+        
+        With feeds enabled, the RSS/Atom feed (FEED_URL or one advertised by
+        the index page) is read first; its entries carry a 'summary' that can
+        stand in for extract_content. The HTML index is scraped when there is
+        no feed or it yields nothing.
+        
+        With a page pattern, up to `workers` archive pages download
+        concurrently ahead of parsing; otherwise rel="next" links are followed
+        one by one. Paging stops at `pages`, at a page without new articles,
+        at a page whose articles are all older than `since` or all `known`,
+        or at `limit`.
+        
+        Args:
+            limit: Stop once this many articles are collected (None = no limit)
+            pages: Maximum index pages to read (0 = no limit)
+            since: Skip articles published before this ISO date (YYYY-MM-DD); undated articles are kept
+            known: Returns True for articles already posted (e.g. by the seen index)
+            workers: Archive pages fetched at the same time
+        """
+        print(f"\n{'=' * 70}")
+        print(f"Crawling {self.HEADING}")
+        print('=' * 70)
+        print(f"URL: {self.URL}")
+        
+        seen = URLDeduper(exclude=[self.URL])  # Normalized URLs, including the index page
+        progress = {'found': 0, 'pages': 0}
+        options = dict(limit=limit, pages=pages, since=since, known=known, workers=workers)
+        
+        try:
+            feed_url, index_page = self._find_feed() if feeds_enabled() else (None, None)
+            if feed_url:
+                print(f"Feed: {feed_url}")
+                try:
+                    yield from self._paginate(feed_url, self.FEED_PAGE_PATTERN, self._read_feed,
+                                              seen, progress, **options)
+                except Exception as e:
+                    print(f"  ⚠ Could not read feed: {str(e)}")
+                if not progress['found']:
+                    print("  ⚠ No articles in the feed, scraping the HTML index instead")
+            
+            if not progress['found']:
+                yield from self._paginate(self.URL, self.PAGE_PATTERN, self._read_html,
+                                          seen, progress, first_page=index_page, **options)
+            
+            pages_read = f" on {progress['pages']} pages" if progress['pages'] > 1 else ""
+            print(f"✓ Found {progress['found']} articles from {self.HEADING}{pages_read}")
+            
+            if not progress['found']:
+                print("⚠ No articles found. The page structure may have changed.")
+        
+        except Exception as e:
+            print(f"❌ Error crawling {self.HEADING}: {str(e)}")
+    
+    def _paginate(self, first_url: str, pattern: Optional[str], read_page: Callable,
+                  seen: URLDeduper, progress: Dict, limit: Optional[int], pages: int, since: Optional[str],
+                  known: Optional[Callable[[Dict], bool]], workers: int,
+                  first_page: Optional[bytes] = None) -> Iterator[List[Dict]]:
+        """
+        Read first_url and the pages after it, yielding each page's new articles
+        
+        Args:
+            pattern: Path of page n relative to first_url (None = follow the next links read_page returns)
+            read_page: (content, page url, since) -> (entries, next page url); entries is a generator
+                of dicts with 'url', 'title', 'published' and optionally 'summary', closed once
+                the page is done with
+            seen: Deduper shared by all pages
+            progress: Counters updated in place: 'found' articles and 'pages' read
+            first_page: Content of first_url when it was already downloaded
+        """
+        fetcher = ThreadPoolExecutor(max_workers=max(1, workers))
+        ahead = deque()  # (url, future) of pages downloading ahead of parsing
+        number = 0
+        
+        try:
+            url = first_url
+            while url and (not pages or number < pages):
+                number += 1
+                if ahead:
+                    url, future = ahead.popleft()
+                elif number == 1 and first_page is not None:
+                    future = Future()
+                    future.set_result(first_page)
+                else:
+                    future = fetcher.submit(self._fetch_index, url)
+                
+                # Page URLs are predictable: keep the next pages downloading while this one is parsed
+                if pattern:
+                    queued = number + len(ahead)
+                    while len(ahead) < workers and (not pages or queued < pages):
+                        queued += 1
+                        page_url = self.page_url(first_url, pattern, queued)
+                        ahead.append((page_url, fetcher.submit(self._fetch_index, page_url)))
+                
+                try:
+                    content = future.result()
+                except Exception as e:
+                    if number == 1:
+                        raise
+                    print(f"  Stopping at page {number}: {str(e)}")  # Usually a 404 past the last page
+                    break
+                progress['pages'] = number
+                
+                entries, next_url = read_page(content, url, since)
+                articles, dated, older = [], 0, 0
+                for entry in entries:
+                    published = entry.get('published')
+                    if since and published:
+                        dated += 1
+                        if published < since:
+                            older += 1
+                            continue
+                    
+                    # Avoid duplicates (also across pages); the article keeps the link as published
+                    if seen.add(entry['url']):
+                        article = {'url': entry['url'], 'title': entry['title'], 'source': self.SOURCE}
+                        if published:
+                            article['published'] = published
+                        if entry.get('summary'):
+                            article['summary'] = entry['summary']
+                        articles.append(article)
+                        if limit and progress['found'] + len(articles) >= limit:
+                            break
+                entries.close()  # Stop parsing the rest of the page
+                
+                progress['found'] += len(articles)
+                if articles:
+                    yield articles
+                
+                if limit and progress['found'] >= limit:
+                    break
+                if number > 1 and not articles and not older:
+                    break  # Past the end of the archive
+                if dated and older == dated:
+                    break  # Archives are newest first: everything further back is older too
+                if known and articles and all(known(article) for article in articles):
+                    break  # Caught up with what earlier runs already posted
+                if not pattern:
+                    url = next_url
+        finally:
+            # Pages downloading ahead are not needed any more
+            for _, future in ahead:
+                future.cancel()
+            ahead.clear()
+            fetcher.shutdown(wait=False, cancel_futures=True)
+    
+    def _fetch_index(self, url: str) -> bytes:
+        with span('index_fetch', source=self.SOURCE):
+            response = get_client().get(url, headers=self.headers, timeout=15)
+        response.raise_for_status()
+        return response.content
+    
+    def _read_html(self, content: bytes, url: str, since: Optional[str]) -> Tuple[Iterator[Dict], Optional[str]]:
+        """Article links of an HTML index page and its rel="next" page"""
+        # Dates sit next to the links, so a date cutoff needs the whole page
+        with span('index_parse', source=self.SOURCE):
+            soup = parse_html(content, parse_only=None if since else self.PARSE_ONLY)
+        
+        def entries():
+            for link, title in self.links(soup):
+                if not title or len(title) <= self.MIN_TITLE_LENGTH:
+                    continue
+                
+                absolute_url = urljoin(url, link['href'])
+                if self.is_article(absolute_url):
+                    yield {'url': absolute_url, 'title': title, 'published': self.published(link) if since else None}
+        
+        return entries(), self.next_page(soup, url)
+    
+    def _read_feed(self, content: bytes, url: str, since: Optional[str]) -> Tuple[Iterator[Dict], None]:
+        """Entries of an RSS/Atom feed page, with summaries cut to the content budget"""
+        def entries():
+            # Fed to the parser slice by slice: entries past the article limit are never parsed
+            slices = (content[i:i + FEED_SLICE] for i in range(0, len(content), FEED_SLICE))
+            with span('index_parse', source=self.SOURCE):
+                for item in iter_feed(slices):
+                    item['url'] = urljoin(url, item['url'])
+                    if urlsplit(item['url']).scheme not in ('http', 'https'):
+                        continue
+                    # Feed descriptions are HTML or plain text; extract_blocks handles both
+                    summary = item['summary'].encode('utf-8')
+                    item['summary'] = get_budget().excerpt(extract_blocks(summary)) if summary else ''
+                    yield item
+        
+        return entries(), None
+    
+    def _find_feed(self) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        FEED_URL, or the feed the index page advertises (looked up once)
+        
+        Returns:
+            The feed URL (None if there is none), and the index page if it was
+            downloaded to look, so scraping it does not download it again
+        """
+        if self.FEED_URL is not None:
+            return self.FEED_URL or None, None
+        
+        content = href = None
+        try:
+            content = self._fetch_index(self.URL)
+            soup = parse_html(content, parse_only=SoupStrainer('link', href=True))
+            href = discover_feed(soup)
+        except Exception:
+            pass
+        self.FEED_URL = urljoin(self.URL, href) if href else ''
+        return self.FEED_URL or None, content
+    
+    @staticmethod
+    def page_url(first_url: str, pattern: str, number: int) -> str:
+        """URL of page `number` (first_url is page 1); patterns starting with ? are query strings"""
+        if pattern.startswith('?'):
+            return first_url + pattern.format(n=number)
+        return urljoin(first_url.rstrip('/') + '/', pattern.format(n=number))
+    
+    def next_page(self, soup, url: str) -> Optional[str]:
+        """Archive page linked with rel="next", if any"""
+        if self.PAGE_PATTERN:
+            return None
+        link = soup.find(['a', 'link'], rel='next', href=True)
+        return urljoin(url, link['href']) if link else None
+    
+    def links(self, soup) -> Iterator[Tuple[object, str]]:
+        """Candidate (<a> tag, title) pairs of an index page; default: every link and its text"""
+        for link in soup.find_all('a', href=True):
+            yield link, link.get_text(strip=True)
+    
+    def is_article(self, url: str) -> bool:
+        """Whether an absolute URL is an article of this blog"""
+        parts = urlsplit(url)
+        return (
+            parts.scheme in ('http', 'https')
+            and _site(parts.netloc) == _site(urlsplit(self.URL).netloc)
+            and self.ARTICLE_PATH in parts.path
+        )
+    
+    @staticmethod
+    def published(link) -> Optional[str]:
+        """Publication date (YYYY-MM-DD) from a <time> element in the link's card, if any"""
+        node = link
+        for _ in range(4):  # The link, its heading and the card around it
+            if node is None:
+                break
+            times = node.find_all('time', limit=2)
+            if len(times) > 1:
+                break  # Climbed past the card into the list of cards
+            if times:
+                match = DATE_PATTERN.search(times[0].get('datetime') or times[0].get_text())
+                return match.group(0) if match else None
+            node = node.parent
+        return None
+    
+    def extract_content(self, url: str) -> str:
+        """
+        Extract main content from an article URL
+        
+        Returns:
+            Article excerpt within the content token budget
+        """
+        try:
+            if streaming_enabled() and not parse_pool_enabled():
+                # Read the page only until the content budget is full
+                with span('content_stream', source=self.SOURCE, article=url):
+                    with get_client().stream(url, headers=self.headers, timeout=10) as response:
+                        response.raise_for_status()
+                        blocks = stream_blocks(response.iter_content(), encoding=response.encoding,
+                                               selectors=self.CONTENT_SELECTORS)
+                        return get_budget().excerpt(blocks)
+            
+            with span('content_fetch', source=self.SOURCE, article=url):
+                response = get_client().get(url, headers=self.headers, timeout=10)
+            response.raise_for_status()
+            
+            with span('content_parse', source=self.SOURCE, article=url):
+                if parse_pool_enabled():
+                    # CPU-bound parsing on another core; this thread goes back to fetching
+                    return parse_in_pool(response.content, self.CONTENT_SELECTORS)
+                # Stops pulling text out of the page once the budget is full
+                return get_budget().excerpt(extract_blocks(response.content, self.CONTENT_SELECTORS))
+        
+        except Exception as e:
+            print(f"  ⚠ Could not extract content: {str(e)}")
+            return ""
@@ -0,0 +1,65 @@
+"""
+Generic Blog Crawler - Extract articles from any blog index with configurable selectors
+"""
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .base import BaseCrawler
+
+
+def source_name(url: str) -> str:
+    """Default source name for a blog URL, e.g. 'lastweekinaws.com/blog'"""
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    path = parts.path.strip('/')
+    return f"{host}/{path}" if path else host
+
+
+class GenericCrawler(BaseCrawler):
+    """
+    Crawl a blog without a site-specific crawler
+    
+    Article links are the anchors matched by link_selector that stay on the
+    blog's host and contain its path (or `path` when given).
+    """
+    
+    def __init__(self, url: str, name: Optional[str] = None, link_selector: str = 'a[href]',
+                 path: Optional[str] = None, min_title_length: int = 15,
+                 content_selectors: Optional[List[str]] = None, page_pattern: Optional[str] = None,
+                 feed_url: Optional[str] = None, feed_page_pattern: Optional[str] = None):
+        """
+        Initialize the crawler
+        
+        Args:
+            url: Blog index page
+            name: Source name used in the output (default: host and path of url)
+            link_selector: CSS selector for article links (or elements containing them)
+            path: URL path part article links must contain (default: the path of url)
+            min_title_length: Ignore links whose text is not longer than this (menus, "Read more")
+            content_selectors: Main-content containers of article pages (default: CONTENT_SELECTORS)
+            page_pattern: Archive page path relative to url, e.g. 'page/{n}/' (default: follow rel="next")
+            feed_url: RSS/Atom feed (default: the one the index page advertises; '' = never use a feed)
+            feed_page_pattern: Older feed pages relative to feed_url, e.g. '?paged={n}'
+        """
+        self.URL = url
+        self.SOURCE = name or source_name(url)
+        self.HEADING = self.SOURCE
+        self.ARTICLE_PATH = path if path is not None else urlsplit(url).path
+        self.MIN_TITLE_LENGTH = min_title_length
+        if content_selectors:
+            self.CONTENT_SELECTORS = content_selectors
+        self.PAGE_PATTERN = page_pattern
+        self.FEED_URL = feed_url
+        self.FEED_PAGE_PATTERN = feed_page_pattern
+        self.link_selector = link_selector
+        if link_selector != 'a[href]':
+            self.PARSE_ONLY = None  # The selector may match containers of the links
+    
+    def links(self, soup) -> Iterator[Tuple[object, str]]:
+        """Links matched by link_selector (or the first link inside each match)"""
+        for element in soup.select(self.link_selector):
+            link = element if element.name == 'a' else element.find('a', href=True)
+            if link is not None and link.get('href'):
+                yield link, link.get_text(strip=True)
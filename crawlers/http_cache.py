@@ -0,0 +1,177 @@
+"""
+HTTP Cache - On-disk conditional-GET cache for blog index and article pages
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class HTTPCache:
+    """
+    Cache response bodies on disk, keyed by URL
+    
+    Entries younger than the TTL are served without a request. Older ones are
+    revalidated with If-None-Match / If-Modified-Since, and a 304 reply is
+    answered from disk. The total body size is capped with LRU eviction.
+    """
+    
+    INDEX_FILE = 'index.json'
+    
+    def __init__(self, directory: str = '.cache/http', ttl: int = 900, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Initialize the cache
+        
+        Args:
+            directory: Directory holding the index and cached bodies
+            ttl: Seconds an entry is served without revalidation (0 = always revalidate)
+            max_bytes: Total size of cached bodies before least-recently-used entries are evicted
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = self._load_index()
+        
+        # Stats
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+    
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Get the cache entry for a URL, if any"""
+        with self.lock:
+            entry = self.entries.get(self._key(url))
+            return dict(entry) if entry else None
+    
+    def is_fresh(self, entry: Dict) -> bool:
+        """Whether an entry can be served without contacting the server"""
+        return time.time() - entry['stored_at'] < self.ttl
+    
+    def conditional_headers(self, entry: Dict) -> Dict[str, str]:
+        """Validators to send with a revalidation request"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def load(self, entry: Dict, revalidated: bool = False) -> Optional[bytes]:
+        """
+        Read a cached body and record the hit
+        
+        Args:
+            entry: Entry returned by lookup()
+            revalidated: True when the server answered 304 Not Modified
+        
+        Returns:
+            The cached body, or None if the file has gone missing
+        """
+        try:
+            body = (self.directory / entry['file']).read_bytes()
+        except OSError:
+            self.discard(entry['url'])
+            return None
+        
+        with self.lock:
+            if revalidated:
+                self.revalidated += 1
+            else:
+                self.hits += 1
+            self.bytes_saved += len(body)
+            
+            current = self.entries.get(self._key(entry['url']))
+            if current:
+                current['last_used'] = time.time()
+                if revalidated:
+                    current['stored_at'] = time.time()
+                self._save_index()
+        
+        return body
+    
+    def store(self, url: str, headers: Dict[str, str], body: bytes):
+        """Cache a 200 response body with its validators"""
+        key = self._key(url)
+        lowered = {k.lower(): v for k, v in headers.items()}
+        
+        with self.lock:
+            self.misses += 1
+            
+            if len(body) > self.max_bytes:
+                return
+            
+            self._write_atomic(self.directory / f"{key}.body", body)
+            now = time.time()
+            self.entries[key] = {
+                'url': url,
+                'file': f"{key}.body",
+                'etag': lowered.get('etag'),
+                'last_modified': lowered.get('last-modified'),
+                'content_type': lowered.get('content-type'),
+                'size': len(body),
+                'stored_at': now,
+                'last_used': now,
+            }
+            self._evict()
+            self._save_index()
+    
+    def record_miss(self):
+        """Count a request that could not be served from cache and was not stored"""
+        with self.lock:
+            self.misses += 1
+    
+    def discard(self, url: str):
+        """Drop a URL from the cache"""
+        with self.lock:
+            entry = self.entries.pop(self._key(url), None)
+            if entry:
+                (self.directory / entry['file']).unlink(missing_ok=True)
+                self._save_index()
+    
+    def summary(self) -> str:
+        """One-line summary for logs and meta.txt"""
+        return (f"{self.hits} fresh hits, {self.revalidated} revalidated (304), "
+                f"{self.misses} misses, {self.bytes_saved / 1024:.1f} KB saved")
+    
+    def _evict(self):
+        """Remove least-recently-used entries until the size bound holds (lock held)"""
+        total = sum(entry['size'] for entry in self.entries.values())
+        if total <= self.max_bytes:
+            return
+        
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]['last_used']):
+            (self.directory / entry['file']).unlink(missing_ok=True)
+            del self.entries[key]
+            total -= entry['size']
+            if total <= self.max_bytes:
+                break
+    
+    def _load_index(self) -> Dict[str, Dict]:
+        path = self.directory / self.INDEX_FILE
+        if not path.exists():
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_index(self):
+        data = json.dumps(self.entries).encode('utf-8')
+        self._write_atomic(self.directory / self.INDEX_FILE, data)
+    
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
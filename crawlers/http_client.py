@@ -0,0 +1,402 @@
+"""
+HTTP Client - Shared, pooled HTTP session used by all crawlers
+"""
+import codecs
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Generator, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .http_cache import HTTPCache
+
+try:
+    # Optional: only needed when HTTP/2 is enabled; httpx.Client(http2=True) also needs h2
+    import h2  # noqa: F401
+    import httpx
+except ImportError:
+    httpx = None
+
+
+# Finish reading an abandoned body when at most this much is left, so the connection can be reused
+DRAIN_LIMIT = 64 * 1024
+
+
+class ConnectionStats:
+    """Thread-safe counters for requests sent and connections opened"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.opened = 0
+        self.bytes_received = 0
+        self.lock = threading.Lock()
+    
+    def request_sent(self):
+        with self.lock:
+            self.requests += 1
+    
+    def received(self, size: int):
+        with self.lock:
+            self.bytes_received += size
+    
+    def connection_opened(self):
+        with self.lock:
+            self.opened += 1
+    
+    @property
+    def reused(self) -> int:
+        """Requests served over an already-open connection"""
+        return max(0, self.requests - self.opened)
+    
+    def summary(self) -> str:
+        """One-line summary for logs and meta.txt"""
+        return (f"{self.requests} requests, {self.opened} connections opened, "
+                f"{self.reused} reused, {self.bytes_received / 1024:.0f} KB received")
+
+
+class HTTPResponse:
+    """Backend-independent response returned by HTTPClient"""
+    
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+    
+    def raise_for_status(self):
+        """Raise requests.HTTPError for 4xx/5xx responses"""
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class StreamingResponse(HTTPResponse):
+    """Response whose body is read chunk by chunk (see HTTPClient.stream)"""
+    
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], chunks: Iterable[bytes],
+                 stats: Optional[ConnectionStats] = None):
+        super().__init__(url, status_code, headers, None)
+        self.chunks = chunks
+        self.stats = stats
+        self.bytes_read = 0
+    
+    @property
+    def encoding(self) -> str:
+        """Charset from the Content-Type header (utf-8 if missing or unknown)"""
+        content_type = next((v for k, v in self.headers.items() if k.lower() == 'content-type'), '')
+        for param in content_type.split(';')[1:]:
+            name, _, value = param.strip().partition('=')
+            if name.lower() == 'charset':
+                try:
+                    return codecs.lookup(value.strip('"\' ')).name
+                except LookupError:
+                    break
+        return 'utf-8'
+    
+    def iter_content(self) -> Iterator[bytes]:
+        """Body chunks as they arrive"""
+        for chunk in self.chunks:
+            self.bytes_read += len(chunk)
+            if self.stats:
+                self.stats.received(len(chunk))
+            yield chunk
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new connection"""
+    
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        self.stats = stats  # Must exist before HTTPAdapter.__init__ builds the pool manager
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+        
+        # Count at socket level: pools also silently reconnect dropped keep-alive connections
+        class CountingHTTPConnection(HTTPConnection):
+            def _new_conn(self):
+                stats.connection_opened()
+                return super()._new_conn()
+        
+        class CountingHTTPSConnection(HTTPSConnection):
+            def _new_conn(self):
+                stats.connection_opened()
+                return super()._new_conn()
+        
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = CountingHTTPConnection
+        
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = CountingHTTPSConnection
+        
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool,
+        }
+
+
+class HTTPClient:
+    """Keep-alive HTTP client with per-host connection pools and optional HTTP/2"""
+    
+    def __init__(self, pool_size: int = 10, http2: bool = False, cache: Optional[HTTPCache] = None,
+                 max_requests_per_host: int = 0):
+        """
+        Initialize the client
+        
+        Args:
+            pool_size: Maximum pooled connections kept open per host (with HTTP/2, across
+                all hosts; each host needs only one multiplexed connection)
+            http2: Use HTTP/2 via httpx[http2] when it is installed (falls back to HTTP/1.1)
+            cache: Optional on-disk cache used for conditional GETs
+            max_requests_per_host: Requests in flight to one host at a time, across
+                all threads (0 = no limit); a streamed response holds its slot until closed
+        """
+        self.stats = ConnectionStats()
+        self.cache = cache
+        self.max_requests_per_host = max_requests_per_host
+        self.host_slots = {}  # host -> BoundedSemaphore
+        self.host_lock = threading.Lock()
+        self.http2 = http2 and httpx is not None
+        
+        if http2 and httpx is None:
+            print("⚠ HTTP/2 requested but httpx[http2] is not installed (pip install 'httpx[http2]'); using HTTP/1.1")
+        
+        if self.http2:
+            self.session = httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=pool_size)
+            )
+        else:
+            self.session = requests.Session()
+            adapter = _CountingAdapter(self.stats, pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+    
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 15) -> HTTPResponse:
+        """
+        Send a GET request over a pooled connection
+        
+        With a cache configured, fresh entries are served without a request
+        and stale ones are revalidated with a conditional GET.
+        
+        Returns:
+            HTTPResponse with status_code, headers and content
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        
+        if entry and self.cache.is_fresh(entry):
+            body = self.cache.load(entry)
+            if body is not None:
+                return self._cached_response(url, entry, body)
+            entry = None
+        
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(self.cache.conditional_headers(entry))
+        
+        response = self._send(url, request_headers, timeout)
+        
+        if self.cache:
+            if response.status_code == 304 and entry:
+                body = self.cache.load(entry, revalidated=True)
+                if body is not None:
+                    return self._cached_response(url, entry, body)
+                # Cached body vanished: fetch again without validators
+                response = self._send(url, dict(headers or {}), timeout)
+            
+            if response.status_code == 200:
+                self.cache.store(url, response.headers, response.content)
+            else:
+                self.cache.record_miss()
+        
+        return response
+    
+    def _send(self, url: str, headers: Dict[str, str], timeout: float) -> HTTPResponse:
+        """Send the request on the configured backend"""
+        with self._host_slot(url):
+            self.stats.request_sent()
+            
+            if self.http2:
+                response = self.session.get(url, headers=headers, timeout=timeout,
+                                            extensions={'trace': self._trace})
+            else:
+                response = self.session.get(url, headers=headers, timeout=timeout)
+        
+        self.stats.received(len(response.content))
+        return HTTPResponse(str(response.url), response.status_code, dict(response.headers), response.content)
+    
+    @contextmanager
+    def stream(self, url: str, headers: Optional[Dict[str, str]] = None,
+               timeout: float = 15, chunk_size: int = 16384) -> Iterator[StreamingResponse]:
+        """
+        Send a GET request and read the body incrementally
+        
+        The connection is closed when the block exits, so a caller that stops
+        reading early never downloads the rest of the body. With a cache,
+        fresh entries and 304 answers to a conditional GET are served as a
+        single chunk, and a 200 body is stored once it has been read to the
+        end; partially read bodies are not stored.
+        
+        Yields:
+            StreamingResponse; read the body with iter_content()
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            body = self.cache.load(entry)
+            if body is not None:
+                yield self._cached_stream(url, entry, body)
+                return
+            entry = None
+        
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(self.cache.conditional_headers(entry))
+        
+        with self._open_stream(url, request_headers, timeout, chunk_size) as response:
+            if not self.cache:
+                yield response
+                return
+            
+            if response.status_code == 304 and entry:
+                body = self.cache.load(entry, revalidated=True)
+                if body is not None:
+                    yield self._cached_stream(url, entry, body)
+                    return
+            elif response.status_code == 200:
+                response.chunks = self._store_when_complete(url, response.headers, response.chunks)
+                try:
+                    yield response
+                finally:
+                    response.chunks.close()
+                return
+            else:
+                self.cache.record_miss()
+                yield response
+                return
+        
+        # Cached body vanished after a 304: fetch it again without validators
+        fetched = self.get(url, headers=headers, timeout=timeout)
+        yield StreamingResponse(fetched.url, fetched.status_code, fetched.headers, [fetched.content])
+    
+    @contextmanager
+    def _open_stream(self, url: str, headers: Dict[str, str], timeout: float,
+                     chunk_size: int) -> Iterator[StreamingResponse]:
+        """Send a streamed GET on the configured backend, holding a slot for the host until closed"""
+        with self._host_slot(url):
+            self.stats.request_sent()
+            
+            if self.http2:
+                with self.session.stream('GET', url, headers=headers, timeout=timeout,
+                                         extensions={'trace': self._trace}) as response:
+                    yield StreamingResponse(str(response.url), response.status_code, dict(response.headers),
+                                            response.iter_bytes(chunk_size), self.stats)
+                return
+            
+            response = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+            try:
+                yield StreamingResponse(str(response.url), response.status_code, dict(response.headers),
+                                        response.iter_content(chunk_size), self.stats)
+            finally:
+                self._release(response)
+    
+    def _store_when_complete(self, url: str, headers: Dict[str, str],
+                             chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+        """
+        Pass body chunks through and cache the body if it is read to the end
+        
+        A reader that stops early (e.g. once the content budget is full) still
+        gets the page cached when at most DRAIN_LIMIT bytes are left, the
+        amount that would be drained to reuse the connection anyway.
+        """
+        parts = []
+        complete = False
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+            complete = True
+        except GeneratorExit:
+            drained = 0
+            for chunk in chunks:
+                parts.append(chunk)
+                drained += len(chunk)
+                self.stats.received(len(chunk))
+                if drained > DRAIN_LIMIT:
+                    break
+            else:
+                complete = True
+            raise
+        finally:
+            if complete:
+                self.cache.store(url, headers, b''.join(parts))
+            else:
+                self.cache.record_miss()
+    
+    def _cached_stream(self, url: str, entry: Dict, body: bytes) -> StreamingResponse:
+        return StreamingResponse(url, 200, self._cached_response(url, entry, body).headers, [body])
+    
+    def _host_slot(self, url: str):
+        """Context manager holding one of the URL's host's request slots (a no-op without a limit)"""
+        if self.max_requests_per_host <= 0:
+            return nullcontext()
+        host = urlsplit(url).netloc.lower()
+        with self.host_lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.max_requests_per_host)
+            return self.host_slots[host]
+    
+    def _release(self, response: requests.Response):
+        """Return a streamed connection to the pool if little is left unread, else drop it"""
+        try:
+            remaining = int(response.headers.get('Content-Length', -1)) - response.raw.tell()
+            if 0 <= remaining <= DRAIN_LIMIT:
+                response.raw.drain_conn()
+                response.raw.release_conn()
+                self.stats.received(remaining)
+        except (ValueError, OSError, requests.RequestException):
+            pass
+        response.close()
+    
+    @staticmethod
+    def _cached_response(url: str, entry: Dict, body: bytes) -> HTTPResponse:
+        headers = {'Content-Type': entry['content_type']} if entry.get('content_type') else {}
+        return HTTPResponse(url, 200, headers, body)
+    
+    def _trace(self, event_name: str, info: dict):
+        """httpcore trace hook: count new TCP connections on the HTTP/2 path"""
+        if event_name == 'connection.connect_tcp.complete':
+            self.stats.connection_opened()
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+_client: Optional[HTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def configure_client(pool_size: int = 10, http2: bool = False,
+                     cache: Optional[HTTPCache] = None, max_requests_per_host: int = 0) -> HTTPClient:
+    """Replace the shared client with one using the given settings"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HTTPClient(pool_size=pool_size, http2=http2, cache=cache,
+                             max_requests_per_host=max_requests_per_host)
+        return _client
+
+
+def get_client() -> HTTPClient:
+    """Get the shared client, creating one with default settings if needed"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient()
+        return _client
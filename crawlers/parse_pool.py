@@ -0,0 +1,77 @@
+"""
+Parse Pool - Main-content extraction in worker processes, outside the GIL
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+from prompt_budget import configure_budget, get_budget
+from .parsing import extract_blocks, get_parser_backend, set_parser_backend
+
+_workers = 0
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def configure_parse_pool(workers: int = 0):
+    """
+    Set where article pages are parsed
+    
+    Args:
+        workers: Worker processes for parsing fetched pages (0 = parse in the fetching thread)
+    """
+    global _workers
+    shutdown_parse_pool()
+    _workers = max(0, workers)
+
+
+def parse_pool_enabled() -> bool:
+    return _workers > 0
+
+
+def _init_worker(backend: str, content_tokens: int, model: str, lead_share: float):
+    """Give a worker process the parent's parser backend and content budget"""
+    set_parser_backend(backend)
+    configure_budget(content_tokens, model).lead_share = lead_share
+
+
+def parse_article(content: bytes, selectors: List[str]) -> str:
+    """Excerpt of a page's main content within the content budget (runs in a worker)"""
+    return get_budget().excerpt(extract_blocks(content, selectors))
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """The shared pool, started on first use with the settings in effect at that time"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            budget = get_budget()
+            # spawn: forking a process that runs HTTP and pipeline threads can copy held locks
+            _pool = ProcessPoolExecutor(
+                max_workers=_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(get_parser_backend(), budget.content_tokens, budget.model, budget.lead_share)
+            )
+        return _pool
+
+
+def parse_in_pool(content: bytes, selectors: Iterable[str]) -> str:
+    """
+    Extract an article excerpt in a worker process and wait for it
+    
+    Only the raw page bytes go to the worker and only the excerpt comes
+    back; the calling thread releases the GIL while it waits, so fetch
+    threads keep downloading while pages are parsed on other cores.
+    """
+    return _get_pool().submit(parse_article, content, list(selectors)).result()
+
+
+def shutdown_parse_pool():
+    """Stop the worker processes (a later parse_in_pool starts new ones)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,158 @@
+"""
+Parsing - Pluggable HTML parser backends shared by all crawlers
+"""
+from typing import Iterable, Iterator, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401  Optional: fast C parser for BeautifulSoup
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser  # Optional: fastest text extraction
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser  # selectolax < 0.3
+    except ImportError:
+        SelectolaxParser = None
+
+BACKENDS = ('html.parser', 'lxml', 'selectolax')
+
+# Elements that never contain article text
+NOISE_TAGS = ['script', 'style', 'nav', 'footer', 'header', 'aside']
+
+# Main-content candidates, most specific container first in document order
+CONTENT_SELECTORS = ['article', 'main', '.post-content', '.blog-content', '.entry-content']
+
+# Text blocks yielded by extract_blocks
+BLOCK_TAGS = ['h1', 'h2', 'h3', 'h4', 'p', 'li']
+
+_backend = 'html.parser'
+
+
+def set_parser_backend(name: str) -> str:
+    """
+    Select the parser backend used by all crawlers
+    
+    Falls back to the built-in html.parser when the requested library is
+    not installed.
+    
+    Returns:
+        Name of the backend actually in use
+    """
+    global _backend
+    name = (name or 'html.parser').lower()
+    
+    if name not in BACKENDS:
+        print(f"⚠ Unknown HTML_PARSER '{name}', using html.parser")
+        name = 'html.parser'
+    elif name == 'lxml' and lxml is None:
+        print("⚠ lxml is not installed (pip install lxml), using html.parser")
+        name = 'html.parser'
+    elif name == 'selectolax' and SelectolaxParser is None:
+        print("⚠ selectolax is not installed (pip install selectolax), using html.parser")
+        name = 'html.parser'
+    
+    _backend = name
+    return _backend
+
+
+def get_parser_backend() -> str:
+    return _backend
+
+
+def parse_html(content: bytes, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Build a BeautifulSoup tree with the fastest available builder
+    
+    Args:
+        content: Raw HTML
+        parse_only: Optional strainer; only matching elements (and their
+            descendants) are added to the tree
+    
+    Returns:
+        BeautifulSoup document
+    """
+    # selectolax has no BeautifulSoup builder; lxml is the closest fast option
+    features = 'lxml' if _backend != 'html.parser' and lxml is not None else 'html.parser'
+    return BeautifulSoup(content, features, parse_only=parse_only)
+
+
+def extract_blocks(content: bytes, selectors: Iterable[str] = CONTENT_SELECTORS,
+                   noise_tags: Iterable[str] = NOISE_TAGS) -> Iterator[Tuple[str, str]]:
+    """
+    Lazily yield the headings and paragraphs of a page's main content
+    
+    Blocks come in document order; text is only pulled out of an element
+    when the caller asks for the next block, so consumers that stop early
+    skip the rest of the page. Pages without block markup yield their whole
+    text as a single paragraph.
+    
+    Yields:
+        (tag name, text) pairs such as ('h2', 'Getting started')
+    """
+    if _backend == 'selectolax':
+        tree = SelectolaxParser(content)
+        tree.strip_tags(list(noise_tags))
+        
+        root = None
+        for selector in selectors:
+            node = tree.css_first(selector)
+            if node is not None and node.text(strip=True):
+                root = node
+                break
+        root = root or tree.body or tree.root
+        if root is None:
+            return
+        
+        found = False
+        for node in root.css(', '.join(BLOCK_TAGS)):
+            if _selectolax_nested(node, root):
+                continue
+            text = node.text(separator=' ', strip=True)
+            if text:
+                found = True
+                yield node.tag, text
+        if not found:
+            text = root.text(separator=' ', strip=True)
+            if text:
+                yield 'p', text
+        return
+    
+    soup = parse_html(content)
+    
+    for tag in soup(list(noise_tags)):
+        tag.decompose()
+    
+    root = None
+    for selector in selectors:
+        main_content = soup.select_one(selector)
+        if main_content and main_content.get_text(strip=True):
+            root = main_content
+            break
+    root = root or soup
+    
+    found = False
+    for element in root.find_all(BLOCK_TAGS):
+        if element.find_parent(BLOCK_TAGS):
+            continue  # e.g. <p> inside <li>: its text is part of the outer block
+        text = element.get_text(separator=' ', strip=True)
+        if text:
+            found = True
+            yield element.name, text
+    if not found:
+        text = root.get_text(separator=' ', strip=True)
+        if text:
+            yield 'p', text
+
+
+def _selectolax_nested(node, root) -> bool:
+    """Whether a selectolax block sits inside another block below root"""
+    parent = node.parent
+    while parent is not None and parent != root:
+        if parent.tag in BLOCK_TAGS:
+            return True
+        parent = parent.parent
+    return False
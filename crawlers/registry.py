@@ -0,0 +1,89 @@
+"""
+Crawler Registry - Build the crawlers for the blog sources listed in urls.txt
+"""
+from typing import Dict, List, Tuple
+
+from url_loader import URLLoader
+from .aws_crawler import AWSCrawler
+from .docker_crawler import DockerCrawler
+from .fullstack_crawler import FullstackCrawler
+from .generic_crawler import GenericCrawler
+from .url_dedupe import normalize_url
+
+# Site-specific crawler classes by the normalized index URL they handle
+CRAWLERS = {}
+
+
+def register(crawler_class):
+    """
+    Use a site-specific crawler for its URL (works as a class decorator)
+    
+    The class needs URL, SOURCE and HEADING attributes, a no-argument
+    constructor, crawl(limit) and extract_content(url).
+    """
+    CRAWLERS[normalize_url(crawler_class.URL)] = crawler_class
+    return crawler_class
+
+
+for _crawler_class in (FullstackCrawler, DockerCrawler, AWSCrawler):
+    register(_crawler_class)
+
+
+def create_crawler(source: Dict):
+    """
+    Build the crawler for one source
+    
+    Args:
+        source: Dict with a 'url' key; other keys are GenericCrawler options
+            and are ignored for URLs with a site-specific crawler
+    """
+    crawler_class = CRAWLERS.get(normalize_url(source['url']))
+    if crawler_class:
+        return crawler_class()
+    
+    options = {key: value for key, value in source.items() if key != 'url'}
+    try:
+        return GenericCrawler(source['url'], **options)
+    except TypeError as e:
+        raise ValueError(f"Invalid options for {source['url']}: {e}") from None
+
+
+class CrawlerRegistry:
+    """Crawlers of all configured sources, in output order, looked up by source name"""
+    
+    def __init__(self, sources: List[Dict]):
+        """
+        Build a crawler per source
+        
+        Args:
+            sources: Source dicts as returned by URLLoader.load_sources
+        """
+        self.crawlers = {}  # source name -> crawler, in file order
+        
+        for source in sources:
+            crawler = create_crawler(source)
+            if crawler.SOURCE in self.crawlers:
+                raise ValueError(f"Duplicate source name '{crawler.SOURCE}' ({source['url']}); "
+                                 f"give one of them a 'name'")
+            self.crawlers[crawler.SOURCE] = crawler
+    
+    @classmethod
+    def from_file(cls, filepath: str) -> 'CrawlerRegistry':
+        """Load sources from a .txt or .json file (see URLLoader.load_sources)"""
+        return cls(URLLoader.load_sources(filepath))
+    
+    @property
+    def sources(self) -> List[Tuple[str, str, object]]:
+        """(log heading, source name, crawler) per source"""
+        return [(crawler.HEADING, name, crawler) for name, crawler in self.crawlers.items()]
+    
+    @property
+    def names(self) -> List[str]:
+        return list(self.crawlers)
+    
+    def crawler(self, source: str):
+        """Crawler for a source name, or None if the source is no longer configured"""
+        return self.crawlers.get(source)
+    
+    def __len__(self) -> int:
+        return len(self.crawlers)
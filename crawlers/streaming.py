@@ -0,0 +1,163 @@
+"""
+Streaming - Incremental main-content extraction from a page as it downloads
+"""
+import codecs
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .parsing import BLOCK_TAGS, CONTENT_SELECTORS, NOISE_TAGS
+
+# Elements without an end tag
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+}
+
+_enabled = True
+_max_bytes = 256 * 1024
+
+
+def configure_streaming(enabled: bool = True, max_bytes: int = 256 * 1024):
+    """
+    Set how crawlers fetch article bodies
+    
+    Args:
+        enabled: Read article pages incrementally and stop once enough text is collected
+        max_bytes: Stop reading a page after this many bytes even if the budget is not full (0 = no cap)
+    """
+    global _enabled, _max_bytes
+    _enabled = enabled
+    _max_bytes = max_bytes
+
+
+def streaming_enabled() -> bool:
+    return _enabled
+
+
+class StreamingBlockParser(HTMLParser):
+    """
+    Collect headings and paragraphs from HTML fed in arbitrary chunks
+    
+    Mirrors extract_blocks: noise elements are ignored and blocks inside the
+    first main-content container (in document order) are preferred; blocks
+    outside any container are kept as a fallback for pages without one.
+    """
+    
+    def __init__(self, selectors: Iterable[str] = CONTENT_SELECTORS):
+        super().__init__(convert_charrefs=True)
+        self.selectors = list(selectors)
+        self.stack = []  # Open tags: [tag, is_container, is_block]
+        self.noise_depth = 0
+        self.container_depth = 0
+        self.found_container = False
+        self.block = None  # (tag, text parts) of the outermost open block
+        self.ready = []  # Finished blocks inside a container
+        self.loose = []  # Finished blocks outside any container
+    
+    def pop_blocks(self) -> List[Tuple[str, str]]:
+        """Take the blocks finished so far"""
+        blocks, self.ready = self.ready, []
+        return blocks
+    
+    def handle_starttag(self, tag: str, attrs: list):
+        if tag in VOID_TAGS:
+            return
+        
+        # A new block implicitly closes an open <p>
+        if tag in BLOCK_TAGS and self.block and self.block[0] == 'p':
+            self._close('p')
+        
+        container = self.noise_depth == 0 and not self.found_container and self._is_container(tag, attrs)
+        starts_block = tag in BLOCK_TAGS and self.block is None and self.noise_depth == 0
+        self.stack.append([tag, container, starts_block])
+        
+        if tag in NOISE_TAGS:
+            self.noise_depth += 1
+        if container:
+            self.container_depth += 1
+            self.found_container = True
+        if starts_block:
+            self.block = (tag, [])
+    
+    def handle_startendtag(self, tag: str, attrs: list):
+        pass  # Self-closing elements carry no text
+    
+    def handle_endtag(self, tag: str):
+        if any(entry[0] == tag for entry in self.stack):
+            self._close(tag)
+    
+    def handle_data(self, data: str):
+        if self.block and self.noise_depth == 0:
+            self.block[1].append(data)
+    
+    def _close(self, tag: str):
+        """Pop open elements up to and including the innermost `tag`"""
+        while self.stack:
+            name, container, is_block = self.stack.pop()
+            if name in NOISE_TAGS:
+                self.noise_depth -= 1
+            if is_block:
+                self._finish_block()
+            if container:
+                self.container_depth -= 1
+            if name == tag:
+                break
+    
+    def _finish_block(self):
+        tag, parts = self.block
+        self.block = None
+        text = ' '.join(''.join(parts).split())
+        if not text:
+            return
+        if self.container_depth > 0:
+            self.ready.append((tag, text))
+        elif not self.found_container:
+            self.loose.append((tag, text))
+    
+    def _is_container(self, tag: str, attrs: list) -> bool:
+        classes = set()
+        for name, value in attrs:
+            if name == 'class' and value:
+                classes.update(value.split())
+        
+        for selector in self.selectors:
+            if selector.startswith('.') and selector[1:] in classes:
+                return True
+            if selector == tag:
+                return True
+        return False
+
+
+def stream_blocks(chunks: Iterable[bytes], max_bytes: Optional[int] = None, encoding: str = 'utf-8',
+                  selectors: Iterable[str] = CONTENT_SELECTORS) -> Iterator[Tuple[str, str]]:
+    """
+    Lazily yield (tag, text) blocks of a page while its body is still arriving
+    
+    Chunks are only pulled while the caller keeps asking for blocks, so a
+    consumer that stops early (e.g. PromptBudget.excerpt) stops the download
+    too. Reading also ends after max_bytes.
+    
+    Args:
+        chunks: Body chunks, e.g. StreamingResponse.iter_content()
+        max_bytes: Byte cap (default: the configured STREAM_MAX_BYTES; 0 = no cap)
+        encoding: Charset of the body
+        selectors: Main-content containers (tag names or .class), as for extract_blocks
+    """
+    max_bytes = _max_bytes if max_bytes is None else max_bytes
+    parser = StreamingBlockParser(selectors)
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    received = 0
+    
+    for chunk in chunks:
+        received += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        yield from parser.pop_blocks()
+        if max_bytes and received >= max_bytes:
+            break
+    else:
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+    
+    yield from parser.pop_blocks()
+    if not parser.found_container:
+        yield from parser.loose
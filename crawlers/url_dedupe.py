@@ -0,0 +1,79 @@
+"""
+URL Dedupe - Constant-time duplicate detection for crawled article links
+"""
+from typing import Iterable
+from urllib.parse import parse_qsl, unquote_plus, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click, not the page ('ref' is left alone: some sites use it for content)
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid',
+    '_hsenc', '_hsmi', 'hsctatracking', 'ref_src',
+}
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def _is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key.startswith('utm_') or key in TRACKING_PARAMS
+
+
+def clean_url(url: str) -> str:
+    """Drop the fragment and tracking query parameters, keeping everything else as written"""
+    parts = urlsplit(url.strip())
+    query = [
+        param for param in parts.query.split('&')
+        if param and not _is_tracking_param(unquote_plus(param.split('=', 1)[0]))
+    ]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, '&'.join(query), ''))
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for duplicate detection
+    
+    On top of clean_url(), lowercases scheme and host, drops default ports
+    and trailing slashes, and sorts the remaining query parameters.
+    """
+    parts = urlsplit(clean_url(url))
+    scheme = parts.scheme.lower()
+    
+    host = (parts.hostname or '').lower()
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    
+    path = parts.path.rstrip('/')
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+class URLDeduper:
+    """Set of normalized URLs; near-duplicate links collapse to one entry"""
+    
+    def __init__(self, exclude: Iterable[str] = ()):
+        """
+        Initialize the deduper
+        
+        Args:
+            exclude: URLs treated as already seen (e.g. the blog index page itself)
+        """
+        self.seen = {normalize_url(url) for url in exclude}
+    
+    def add(self, url: str) -> bool:
+        """
+        Record a URL
+        
+        Returns:
+            True if the URL was not seen before, False for a duplicate
+        """
+        key = normalize_url(url)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        return True
+    
+    def __contains__(self, url: str) -> bool:
+        return normalize_url(url) in self.seen
+    
+    def __len__(self) -> int:
+        return len(self.seen)
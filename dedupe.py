@@ -0,0 +1,177 @@
+"""
+Dedupe - Near-duplicate detection with MinHash signatures and an LSH index
+"""
+import hashlib
+import re
+import threading
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+# Version and issue numbers in titles ("Docker Desktop 4.30")
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)*')
+
+
+def shingles(text: str, size: int = 5) -> Set[str]:
+    """Overlapping character n-grams of text, ignoring case, punctuation and spacing"""
+    normalized = ' '.join(re.findall(r'\w+', text.lower()))
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+class MinHasher:
+    """
+    Fixed-length MinHash signatures whose agreement estimates Jaccard similarity
+    
+    Uses one-permutation hashing: every shingle is hashed once and falls
+    into one of `num_perm` bins, each keeping its minimum, instead of
+    hashing every shingle `num_perm` times. Bins left empty by short texts
+    borrow the nearest filled bin to their right (densification), so
+    signatures of titles stay comparable.
+    """
+    
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5):
+        """
+        Initialize the hasher
+        
+        Args:
+            num_perm: Signature length (more is more accurate)
+            shingle_size: Characters per shingle
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+    
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """MinHash signature of a text (empty for text without words)"""
+        bins = [None] * self.num_perm
+        for shingle in shingles(text, self.shingle_size):
+            h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+            position, value = (h >> 32) % self.num_perm, h & 0xFFFFFFFF
+            if bins[position] is None or value < bins[position]:
+                bins[position] = value
+        
+        filled = [position for position, value in enumerate(bins) if value is not None]
+        if not filled:
+            return ()
+        
+        signature = list(bins)
+        if len(filled) < self.num_perm:
+            # Walk left from the last filled bin; empty bins take the nearest filled value, tagged with the distance
+            nearest, distance = bins[filled[-1]], 0
+            for step in range(1, self.num_perm):
+                position = (filled[-1] - step) % self.num_perm
+                distance += 1
+                if bins[position] is None:
+                    signature[position] = (distance << 32) | nearest
+                else:
+                    nearest, distance = bins[position], 0
+        return tuple(signature)
+    
+    @staticmethod
+    def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity: the fraction of signature positions that agree"""
+        if not first or len(first) != len(second):
+            return 0.0
+        return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+
+class LSHIndex:
+    """
+    Locality-sensitive hashing over MinHash signatures
+    
+    Signatures are cut into bands; two signatures become candidates when
+    any band matches exactly. A lookup touches only its own buckets, so
+    indexing n items costs about O(n) instead of comparing every pair.
+    """
+    
+    def __init__(self, num_perm: int = 64, bands: int = 16):
+        """
+        Initialize the index
+        
+        Args:
+            num_perm: Signature length
+            bands: Number of bands; more bands find less similar pairs (rows per band = num_perm / bands)
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.rows = num_perm // bands
+        self.buckets = [{} for _ in range(bands)]  # per band: band values -> keys
+        self.signatures = {}
+    
+    def _bands(self, signature: Tuple[int, ...]):
+        for band, buckets in enumerate(self.buckets):
+            yield buckets, signature[band * self.rows:(band + 1) * self.rows]
+    
+    def candidates(self, signature: Tuple[int, ...]) -> List[Hashable]:
+        """Keys sharing at least one band with the signature, in insertion order"""
+        found = {}
+        for buckets, band in self._bands(signature):
+            for key in buckets.get(band, ()):
+                found[key] = True
+        return list(found)
+    
+    def add(self, key: Hashable, signature: Tuple[int, ...]):
+        self.signatures[key] = signature
+        for buckets, band in self._bands(signature):
+            buckets.setdefault(band, []).append(key)
+    
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+
+class Deduplicator:
+    """Keep the first article of each cluster of near-duplicates and report the rest"""
+    
+    def __init__(self, threshold: float = 0.85, num_perm: int = 64, bands: int = 16):
+        """
+        Initialize the deduplicator
+        
+        Args:
+            threshold: Estimated Jaccard similarity of title and content at which articles are duplicates
+            num_perm: MinHash signature length
+            bands: LSH bands (see LSHIndex)
+        """
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.index = LSHIndex(num_perm, bands)
+        self.kept = {}  # URL -> article
+        self.numbers = {}  # URL -> numbers in the title
+        self.duplicates = []  # (duplicate article, kept article, similarity)
+        self.lock = threading.Lock()
+    
+    def check(self, article: Dict, content: str = "") -> Optional[Tuple[Dict, float]]:
+        """
+        Compare an article with every article kept so far
+        
+        Args:
+            article: Dict with 'title' and 'url' keys
+            content: Extracted content or feed summary ("" compares titles only)
+        
+        Returns:
+            (kept article, similarity) if the article is a near-duplicate of
+            one, or None after keeping it as the representative of a new cluster
+        """
+        signature = self.hasher.signature(f"{article['title']}\n{content}")
+        # Near-identical titles with different numbers are different releases, not copies
+        numbers = set(NUMBER_PATTERN.findall(article['title']))
+        
+        with self.lock:
+            best, best_similarity = None, 0.0
+            for url in self.index.candidates(signature) if signature else ():
+                if self.numbers[url] != numbers:
+                    continue
+                similarity = self.hasher.similarity(signature, self.index.signatures[url])
+                if similarity > best_similarity:
+                    best, best_similarity = url, similarity
+            
+            if best is not None and best_similarity >= self.threshold:
+                self.duplicates.append((article, self.kept[best], best_similarity))
+                return self.kept[best], best_similarity
+            
+            if signature:
+                self.index.add(article['url'], signature)
+            self.kept[article['url']] = article
+            self.numbers[article['url']] = numbers
+            return None
+    
+    def summary(self) -> str:
+        return f"{len(self.duplicates)} duplicates of {len(self.kept)} kept articles (threshold {self.threshold:.2f})"
@@ -0,0 +1,107 @@
+"""
+Generation Cache - Persistent, content-addressed store of generated posts
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class GenerationCache:
+    """
+    Cache generated posts in SQLite, keyed by a hash of the request
+    
+    The key covers model, temperature, max_tokens and the full prompt, so any
+    change to the prompt or generation settings results in a new API call.
+    """
+    
+    def __init__(self, path: str = '.cache/generations.db', max_age_days: int = 30, max_entries: int = 5000):
+        """
+        Initialize the cache
+        
+        Args:
+            path: SQLite database file
+            max_age_days: Entries older than this are evicted (0 = never)
+            max_entries: Least recently used entries beyond this count are evicted (0 = unlimited)
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            """CREATE TABLE IF NOT EXISTS generations (
+                key TEXT PRIMARY KEY,
+                post TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self.db.commit()
+    
+    @staticmethod
+    def make_key(model: str, temperature: float, max_tokens: int, prompt: str) -> str:
+        """Hash the parameters that determine a completion"""
+        payload = json.dumps([model, temperature, max_tokens, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached post, or None on a miss"""
+        with self.lock:
+            row = self.db.execute("SELECT post FROM generations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            self.db.execute("UPDATE generations SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+            return row[0]
+    
+    def put(self, key: str, post: str):
+        """Store a generated post"""
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO generations (key, post, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, post, now, now)
+            )
+            self.db.commit()
+    
+    def prune(self) -> int:
+        """
+        Evict entries by age, then by count
+        
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        with self.lock:
+            if self.max_age_days > 0:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += self.db.execute("DELETE FROM generations WHERE created_at < ?", (cutoff,)).rowcount
+            
+            if self.max_entries > 0:
+                removed += self.db.execute(
+                    """DELETE FROM generations WHERE key NOT IN (
+                        SELECT key FROM generations ORDER BY last_used DESC LIMIT ?
+                    )""",
+                    (self.max_entries,)
+                ).rowcount
+            
+            self.db.commit()
+        return removed
+    
+    def summary(self) -> str:
+        """One-line summary for logs and meta.txt"""
+        return f"{self.hits} hits, {self.misses} misses"
+    
+    def close(self):
+        with self.lock:
+            self.db.close()
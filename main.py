@@ -1,31 +1,140 @@
 """
 LinkedIn Post Generator - Main Application
-Uses three fixed blog sources: Fullstack, Expo, and AWS DevOps
+Crawls the blog sources listed in urls.txt (URLS_FILE)
 """
+import argparse
 import csv
 import json
-import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterable, Iterator, List, Dict, Optional
 
+from article_index import SeenArticleIndex, NEW, CHANGED, UNCHANGED
+from async_generator import AsyncPostGenerator
+from checkpoint import Checkpoint
 from config import Config
-from crawlers import FullstackCrawler, DockerCrawler, AWSCrawler
+from crawlers import (
+    CrawlerRegistry, HTTPCache, configure_client, configure_feeds, configure_parse_pool, configure_streaming,
+    set_parser_backend, shutdown_parse_pool
+)
+from dedupe import Deduplicator
+from generation_cache import GenerationCache
+from metrics import METRICS, span
+from output_writer import PostLog
+from pipeline import Pipeline, Stage, SKIP
 from post_generator import PostGenerator
+from prompt_budget import configure_budget
+from rate_limiter import RateLimiter
 
 
 class LinkedInPostApp:
     """Main application orchestrator"""
     
-    def __init__(self):
+    def __init__(self, regenerate: bool = False, full: bool = False, resume: bool = False,
+                 batch: bool = False):
+        """
+        Initialize the application
+        
+        Args:
+            regenerate: Ignore cached posts and call the API for every article
+            full: Process every crawled article, including ones already posted
+            resume: Continue the interrupted run recorded in the checkpoint file
+            batch: Generate through the OpenAI Batch API (also GENERATION_MODE=batch)
+        """
         self.config = Config()
         self.config.validate()
+        PostGenerator.check_pack_size(self.config.pack_size)
+        if batch and self.config.generation_mode == 'async':
+            raise ValueError("--batch cannot be combined with GENERATION_MODE=async; unset it or use GENERATION_MODE=batch")
+        
+        # One pooled keep-alive session shared by every crawler
+        http_cache = None
+        if self.config.http_cache:
+            http_cache = HTTPCache(
+                self.config.http_cache_dir,
+                ttl=self.config.http_cache_ttl,
+                max_bytes=self.config.http_cache_max_mb * 1024 * 1024
+            )
+        self.http_client = configure_client(
+            pool_size=self.config.http_pool_size,
+            http2=self.config.http2,
+            cache=http_cache,
+            max_requests_per_host=max(1, self.config.max_requests_per_host)
+        )
         
-        self.fullstack = FullstackCrawler()
-        self.docker = DockerCrawler()
-        self.aws = AWSCrawler()
-        self.generator = PostGenerator(self.config.openai_api_key, self.config.custom_hashtags)
+        self.parser_backend = set_parser_backend(self.config.html_parser)
+        self.budget = configure_budget(self.config.content_token_budget, PostGenerator.MODEL)
+        configure_streaming(self.config.stream_extract, self.config.stream_max_bytes)
+        configure_feeds(self.config.feed_first)
+        configure_parse_pool(self.config.parse_workers)
+        
+        # Site-specific crawlers for known blogs, GenericCrawler for the rest
+        self.registry = CrawlerRegistry.from_file(self.config.urls_file)
+        self.rate_limiter = RateLimiter(
+            self.config.openai_requests_per_minute,
+            self.config.openai_tokens_per_minute
+        )
+        self.generation_cache = None
+        if self.config.generation_cache:
+            self.generation_cache = GenerationCache(
+                self.config.generation_cache_path,
+                max_age_days=self.config.generation_cache_max_age_days,
+                max_entries=self.config.generation_cache_max_entries
+            )
+            self.generation_cache.prune()
+        generator_options = dict(
+            rate_limiter=self.rate_limiter,
+            cache=self.generation_cache,
+            force_regenerate=regenerate,
+            base_url=self.config.openai_base_url,
+            budget=self.budget
+        )
+        # Async mode raises GenerationError after retries instead of writing error text as a post
+        self.async_mode = self.config.generation_mode == 'async'
+        if self.async_mode:
+            self.generator = AsyncPostGenerator(
+                self.config.openai_api_key,
+                self.config.custom_hashtags,
+                timeout=self.config.openai_timeout,
+                max_retries=self.config.openai_max_retries,
+                stream=self.config.openai_stream,
+                **generator_options
+            )
+        else:
+            self.generator = PostGenerator(
+                self.config.openai_api_key,
+                self.config.custom_hashtags,
+                **generator_options
+            )
+        self.deduplicator = None  # Near-duplicate index of the current generate_posts run
         self.log_messages = []  # Store log messages for meta.txt
+        self.stage_stats = []  # Pipeline stage stats from the last generate_posts run
+        self.post_log = None  # JSONL log the current run streams posts into
+        
+        # Crash recovery: progress is checkpointed after every finished article
+        self.resume = resume
+        self.resumed = False
+        self.checkpoint = Checkpoint(self.config.checkpoint_file)
+        
+        # Batch mode trades latency for throughput and cost on large backfills
+        self.batch = batch or self.config.generation_mode == 'batch'
+        
+        # Paged crawls read archive pages and stream articles into generation as they are found
+        self.paged = self.config.crawl_pages != 1 or bool(self.config.crawl_since)
+        
+        # Incremental runs: skip articles already turned into posts
+        self.full = full
+        self.seen_index = None
+        if self.config.seen_index:
+            self.seen_index = SeenArticleIndex(self.config.seen_index_path)
+        self.article_counts = {NEW: 0, CHANGED: 0, 'skipped': 0}
+        self._counts_lock = threading.Lock()
+        
+        # Blog sources in output order: (log heading, source name, crawler)
+        self.sources = self.registry.sources
     
     def log(self, message: str):
         """Log message to both console and meta file"""
@@ -35,190 +144,556 @@ class LinkedInPostApp:
     def run(self):
         """Run the complete workflow"""
         start_time = datetime.now()
+        METRICS.reset()
         
         self.log("=" * 70)
         self.log("LinkedIn Post Generator")
         self.log("=" * 70)
         self.log(f"Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        self.log("\nCrawling three fixed blog sources:")
-        self.log("  • Fullstack Labs Blog")
-        self.log("  • Docker Blog")
-        self.log("  • AWS DevOps Blog")
-        
-        # Crawl all three blogs
-        all_articles = []
+        self.log(f"HTML parser: {self.parser_backend}")
+        if self.config.extract_content:
+            if self.config.parse_workers > 0:
+                mode = f", parsed in {self.config.parse_workers} processes"
+            else:
+                mode = ', streamed' if self.config.stream_extract else ''
+            self.log(f"Content budget: {self.budget.content_tokens} tokens, {self.budget.counter}{mode}")
         
-        # Crawl Fullstack
-        self.log("\n" + "=" * 70)
-        self.log("Crawling Fullstack Blog")
-        self.log("=" * 70)
-        fullstack_articles = self.fullstack.crawl()
-        all_articles.extend(fullstack_articles)
-        self.log(f"✓ Found {len(fullstack_articles)} articles from Fullstack")
+        done = None
+        if self.resume:
+            self.resumed = self.checkpoint.load()
+            if not self.resumed:
+                self.log("\n⚠ No checkpoint found, starting a fresh run")
         
-        # Crawl Docker
-        self.log("\n" + "=" * 70)
-        self.log("Crawling Docker Blog")
-        self.log("=" * 70)
-        docker_articles = self.docker.crawl()
-        all_articles.extend(docker_articles)
-        self.log(f"✓ Found {len(docker_articles)} articles from Docker")
-        
-        # Crawl AWS
-        self.log("\n" + "=" * 70)
-        self.log("Crawling AWS DevOps Blog")
-        self.log("=" * 70)
-        aws_articles = self.aws.crawl()
-        all_articles.extend(aws_articles)
-        self.log(f"✓ Found {len(aws_articles)} articles from AWS DevOps")
+        if self.resumed:
+            all_articles = self.checkpoint.articles
+            done = self.checkpoint.done()
+            self.log(f"\nResuming run started at {self.checkpoint.started_at}: "
+                     f"{len(done)} of {len(all_articles)} articles already finished")
+        elif self.paged:
+            # Articles join the checkpoint page by page while generation is already running
+            self.log_sources()
+            self.checkpoint.start([])
+            all_articles = self.stream_articles()
+        else:
+            all_articles = self.collect_articles()
+            if not all_articles:
+                self.log_http_stats()
+                self.save_meta()
+                return
+            self.checkpoint.start(all_articles)
         
-        self.log(f"\n{'=' * 70}")
-        self.log(f"Total articles found: {len(all_articles)}")
-        self.log('=' * 70)
+        # Generate posts for all articles (paged runs log the header once the first page is in)
+        if not self.paged or self.resumed:
+            self.log_generation_header()
         
-        if not all_articles:
-            self.log("\n❌ No articles found from any blog")
-            self.save_meta()
-            return
+        try:
+            self.generate_posts(all_articles, done=done)
+        finally:
+            shutdown_parse_pool()
+            if self.async_mode:
+                self.generator.close()
         
-        # Generate posts for all articles
-        self.log(f"\n{'=' * 70}")
-        self.log(f"Generating LinkedIn Posts")
-        self.log('=' * 70)
+        self.log(f"\nPipeline stats:")
+        for stage in self.stage_stats:
+            self.log(f"  • {stage.summary()}")
+        if self.config.pack_size > 1 and not self.batch:
+            self.log(f"Prompt packing: {self.generator.packing_summary()}")
+        if self.async_mode:
+            self.log(f"OpenAI retries: {self.generator.retry_summary()}")
+        if self.deduplicator:
+            self.log_duplicates()
+        if self.generation_cache:
+            self.log(f"Generation cache: {self.generation_cache.summary()}")
+        if self.seen_index and not self.full and not self.resumed:
+            self.log_article_counts()
         
-        results = self.generate_posts(all_articles)
+        # Keep the checkpoint while articles are left, so --resume can retry them
+        remaining = len(self.checkpoint.articles) - len(self.checkpoint.done())
+        if remaining:
+            self.checkpoint.save()  # Fold the journal into one snapshot for --resume
+            self.log(f"\n⚠ {remaining} articles did not finish; run `python3 main.py --resume` to retry them")
+        else:
+            self.checkpoint.clear()
         
-        if results:
-            # Save results
-            self.save_results(results)
+        total_posts = len(self.post_log)
+        if total_posts:
+            # Build the grouped TXT view from the post log
+            self.save_results()
             
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
             
             self.log(f"\n{'=' * 70}")
-            self.log(f"✅ COMPLETED! Generated {len(results)} LinkedIn posts")
+            self.log(f"✅ COMPLETED! Generated {total_posts} LinkedIn posts")
             self.log('=' * 70)
             self.log(f"\nBreakdown by source:")
             
-            # Count by source
-            sources = {}
-            for result in results:
-                source = result.get('source', 'Unknown')
-                sources[source] = sources.get(source, 0) + 1
-            
-            for source, count in sources.items():
+            for source, count in self.post_log.counts().items():
                 self.log(f"  • {source}: {count} posts")
             
             self.log(f"\nFiles created:")
             self.log(f"  📄 {self.config.output_file}")
+            self.log(f"  📄 {self.config.post_log_file}")
             self.log(f"  📄 output/meta.txt")
             self.log(f"\nCompleted at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
             self.log(f"Total duration: {duration:.1f} seconds")
         else:
             self.log("\n❌ No posts generated")
         
+        self.log_http_stats()
+        
         # Save meta file
         self.save_meta()
     
-    def generate_posts(self, articles: List[Dict]) -> List[Dict]:
-        """Generate LinkedIn posts for all articles"""
-        results = []
+    def collect_articles(self) -> List[Dict]:
+        """
+        Crawl every source and keep the articles this run should post about
         
-        print(f"\n{'=' * 70}")
-        print(f"Generating LinkedIn Posts")
-        print('=' * 70)
+        Returns:
+            Selected articles (empty if nothing needs to be generated)
+        """
+        self.log_sources()
         
-        for i, article in enumerate(articles, 1):
-            print(f"\n[{i}/{len(articles)}] {article['source']}: {article['title'][:50]}...")
-            
-            # Optionally extract content
-            content = ""
-            if self.config.extract_content:
-                print("  → Extracting content...")
-                # Use the appropriate crawler based on source
-                if article['source'] == 'Fullstack':
-                    content = self.fullstack.extract_content(article['url'])
-                elif article['source'] == 'Docker':
-                    content = self.docker.extract_content(article['url'])
-                elif article['source'] == 'AWS DevOps':
-                    content = self.aws.extract_content(article['url'])
-            
-            # Generate post
-            print("  → Generating post...")
-            post = self.generator.generate(article, content)
-            
-            # Store result
-            result = {
-                'source': article['source'],
-                'article_url': article['url'],
-                'article_title': article['title'],
-                'linkedin_post': post,
-                'generated_at': datetime.now().isoformat()
-            }
+        # Crawl all blogs concurrently, then log per source in urls.txt order
+        all_articles = []
+        
+        for (heading, name, _), articles in zip(self.sources, self.crawl_all()):
+            self.log("\n" + "=" * 70)
+            self.log(f"Crawling {heading}")
+            self.log("=" * 70)
+            all_articles.extend(articles)
+            self.log(f"✓ Found {len(articles)} articles from {name}")
+        
+        self.log(f"\n{'=' * 70}")
+        self.log(f"Total articles found: {len(all_articles)}")
+        self.log('=' * 70)
+        
+        if not all_articles:
+            self.log("\n❌ No articles found from any blog")
+            return []
+        
+        if self.seen_index and not self.full:
+            all_articles = self.select_articles(all_articles)
             
-            results.append(result)
-            print(f"  ✓ Done ({len(post)} chars)")
+            if not all_articles:
+                self.log("\n✓ No new or changed articles since the last run")
+                self.log_article_counts()
+        
+        return all_articles
+    
+    def log_sources(self):
+        self.log(f"\nCrawling {len(self.sources)} blog sources from {self.config.urls_file}:")
+        for heading, _, _ in self.sources:
+            self.log(f"  • {heading}")
+        if self.paged:
+            depth = self.config.crawl_pages or 'all'
+            since = f", published since {self.config.crawl_since}" if self.config.crawl_since else ""
+            self.log(f"Reading up to {depth} index pages per source{since}")
+    
+    def stream_articles(self) -> Iterator[Dict]:
+        """
+        Crawl every source page by page, yielding articles as soon as their index page is parsed
+        
+        Generation starts on the first pages while archive pages are still
+        downloading. Selected articles are added to the checkpoint before they
+        are yielded, so --resume covers everything handed out so far.
+        """
+        pages = queue.Queue()
+        counts = {name: 0 for _, name, _ in self.sources}
+        selected = 0
+        
+        def crawl(heading, name, crawler):
+            try:
+                for page in self._crawl_source_pages(crawler, heading):
+                    pages.put((name, page))
+            finally:
+                pages.put((name, None))  # This source is finished
+        
+        workers = max(1, min(self.config.max_parallel_crawls, len(self.sources)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for heading, name, crawler in self.sources:
+                executor.submit(crawl, heading, name, crawler)
             
-            # Rate limiting to avoid API throttling
-            time.sleep(1)
+            running = len(self.sources)
+            while running:
+                name, page = pages.get()
+                if page is None:
+                    running -= 1
+                    continue
+                
+                counts[name] += len(page)
+                if self.seen_index and not self.full:
+                    page = [article for article in map(self._select, page) if article]
+                if page:
+                    self.checkpoint.add(page)
+                    if not selected:
+                        self.log_generation_header()
+                    selected += len(page)
+                    yield from page
+        
+        self.log(f"\n{'=' * 70}")
+        for name, count in counts.items():
+            self.log(f"✓ Found {count} articles from {name}")
+        self.log(f"Total articles found: {sum(counts.values())}")
+        if self.seen_index and not self.full:
+            self.log(f"Incremental run: {selected} of {sum(counts.values())} articles selected")
+        self.log('=' * 70)
+    
+    def log_generation_header(self):
+        self.log(f"\n{'=' * 70}")
+        self.log(f"Generating LinkedIn Posts")
+        self.log('=' * 70)
+    
+    def crawl_all(self) -> List[List[Dict]]:
+        """
+        Crawl every blog source concurrently
+        
+        Returns:
+            One list of articles per source, in the same order as self.sources
+        """
+        workers = max(1, min(self.config.max_parallel_crawls, len(self.sources)))
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._crawl_source, crawler) for _, _, crawler in self.sources]
+            return [future.result() for future in futures]
+    
+    def _crawl_source(self, crawler) -> List[Dict]:
+        """Crawl a single source"""
+        return [article for page in self._crawl_source_pages(crawler) for article in page]
+    
+    def _crawl_source_pages(self, crawler, heading: Optional[str] = None) -> Iterator[List[Dict]]:
+        """
+        Crawl a single source page by page (the shared client limits requests per host)
+        
+        Args:
+            crawler: Crawler of the source
+            heading: Logged as a "Crawling <heading>" block before the first page,
+                or when the source has none (None = not logged)
+        """
+        # MAX_ARTICLES_PER_URL caps each source; 0 means no limit
+        limit = self.config.max_articles_per_url or None
+        
+        # Stop paging once a page holds only articles that were already posted
+        known = None
+        if self.seen_index and not self.full:
+            known = lambda article: self.seen_index.classify(article) == UNCHANGED
+        
+        pages = crawler.crawl_pages(
+            limit=limit,
+            pages=self.config.crawl_pages,
+            since=self.config.crawl_since,
+            known=known,
+            workers=self.config.max_requests_per_host
+        )
+        for page in pages:
+            if heading:
+                self._log_crawl_heading(heading)
+                heading = None
+            yield page
+        if heading:
+            self._log_crawl_heading(heading)
+    
+    def _log_crawl_heading(self, heading: str):
+        # One message, so headings of sources crawled in parallel don't interleave
+        self.log(f"\n{'=' * 70}\nCrawling {heading}\n{'=' * 70}")
+    
+    def select_articles(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Keep only articles that are new or changed since they were last posted
+        
+        With SEEN_CHECK_CONTENT and EXTRACT_CONTENT enabled, articles with an
+        unchanged title are kept too and compared by content after extraction.
+        """
+        selected = [article for article in map(self._select, articles) if article]
+        
+        self.log(f"\nIncremental run: {len(selected)} of {len(articles)} articles selected "
+                 f"({len(articles) - len(selected)} already posted)")
+        return selected
+    
+    def _select(self, article: Dict) -> Optional[Dict]:
+        """The article with its seen-index status, or None if it was already posted"""
+        check_content = self.config.seen_check_content and self.config.extract_content
+        status = self.seen_index.classify(article)
+        
+        if status == UNCHANGED and not check_content:
+            self._count('skipped')
+            return None
+        if status != UNCHANGED:
+            self._count(status)
+        
+        return dict(article, status=status)
+    
+    def _count(self, key: str):
+        with self._counts_lock:
+            self.article_counts[key] += 1
+    
+    def log_article_counts(self):
+        """Log how many articles were new, changed or skipped as already posted"""
+        counts = self.article_counts
+        self.log(f"Articles: {counts[NEW]} new, {counts[CHANGED]} changed, {counts['skipped']} skipped")
+    
+    def log_duplicates(self):
+        """Log the near-duplicate articles skipped this run and the article each one duplicated"""
+        self.log(f"Near-duplicates: {self.deduplicator.summary()}")
+        for article, kept, similarity in self.deduplicator.duplicates:
+            self.log(f"  • {article['source']}: {article['title']} ({article['url']})")
+            self.log(f"    duplicate of {kept['source']}: {kept['title']} ({kept['url']}), similarity {similarity:.2f}")
+    
+    def generate_posts(self, articles: Iterable[Dict], done: Optional[set] = None) -> List[Dict]:
+        """
+        Generate LinkedIn posts for all articles
+        
+        Runs as a streaming pipeline: with EXTRACT_CONTENT enabled, extraction
+        workers feed a bounded queue that generation workers drain, so page
+        fetches overlap with OpenAI calls. The shared rate limiter keeps the
+        OpenAI calls inside the RPM/TPM budgets. Each post is appended to the
+        JSONL post log as soon as it is generated.
+        
+        With PACK_SIZE > 1, each generation worker takes up to that many
+        waiting articles and generates them with one request. In batch mode
+        the pipeline only extracts; all prompts are then submitted as a
+        single OpenAI batch.
+        
+        With DEDUPE enabled, a single-worker stage between extraction and
+        generation compares each article's title and content with the
+        articles kept so far (MinHash with an LSH index); near-duplicates
+        are skipped, so each cluster gets one post. The stage takes articles
+        in input order whatever order extraction finishes them in, so the
+        post goes to the same article of a cluster on every run.
+        
+        Args:
+            articles: Articles of the run, in output order; may be a generator
+                that yields them while crawling is still going (paged crawls)
+            done: URLs finished by an interrupted run; they are skipped and
+                their posts are kept in the post log (None = fresh run)
+        
+        Returns:
+            Source and URL of each generated post, in the same order as the input articles
+        """
+        if isinstance(articles, list):  # A crawl still streaming in logs its own header
+            print(f"\n{'=' * 70}")
+            print(f"Generating LinkedIn Posts")
+            print('=' * 70)
+        
+        stages = []
+        if self.config.extract_content:
+            stages.append(Stage('extract', self._extract_stage, self.config.extract_workers))
+        self.deduplicator = None
+        if self.config.dedupe:
+            self.deduplicator = Deduplicator(self.config.dedupe_threshold)
+            stages.append(Stage('dedupe', self._dedupe_stage, ordered=True))
+        if self.batch:
+            pass  # Generated after extraction, as one Batch API job
+        elif self.config.pack_size > 1:
+            stages.append(Stage('generate', self._generate_pack_stage, self.config.max_concurrent_requests,
+                                batch_size=self.config.pack_size))
+        else:
+            stages.append(Stage('generate', self._generate_stage, self.config.max_concurrent_requests))
+        
+        total = len(articles) if isinstance(articles, list) else '?'  # Unknown while still crawling
+        
+        def jobs():
+            for i, article in enumerate(articles, 1):
+                if done and article['url'] in done:
+                    continue
+                saved = self.checkpoint.content(article['url'])
+                yield {
+                    'index': i, 'total': total, 'article': article,
+                    'content': saved or "", 'extracted': saved is not None
+                }
+        
+        self.post_log = PostLog(self.config.post_log_file, keep=done, source_order=self.registry.names)
+        try:
+            if stages:
+                results = Pipeline(stages, queue_size=self.config.pipeline_queue_size).run(jobs())
+            else:
+                results = list(jobs())
+            if self.batch:
+                results = self._generate_batch(results)
+        finally:
+            self.post_log.close()
+        self.stage_stats = stages
         
         return results
     
-    def save_results(self, results: List[Dict]):
-        """Save results to TXT file grouped by source with easy copy-paste format"""
+    def _extract_stage(self, job: Dict) -> Dict:
+        """Pipeline stage: fetch the article body with the source's crawler"""
+        article = job['article']
+        if job['extracted']:
+            return job  # Content saved by the interrupted run, already past the checks below
+        
+        print(f"\n[{job['index']}/{job['total']}] Extracting {article['source']}: {article['title'][:50]}...")
+        
+        crawler = self.registry.crawler(article['source'])
+        if self.config.feed_summaries and article.get('summary'):
+            job['content'] = article['summary']  # Already cut to the content budget; no page fetch
+        elif crawler:
+            job['content'] = crawler.extract_content(article['url'])
+        else:
+            print(f"  ⚠ Source '{article['source']}' is no longer in {self.config.urls_file}; generating from the title")
+        
+        # Title unchanged since the last post: only regenerate if the body changed
+        if article.get('status') == UNCHANGED:
+            if not self.seen_index.content_changed(article, job['content']):
+                self._count('skipped')
+                self.checkpoint.finish(article['url'])
+                return SKIP
+            self._count(CHANGED)
+        
+        self.checkpoint.save_content(article['url'], job['content'])
+        return job
+    
+    def _dedupe_stage(self, job: Dict) -> Dict:
+        """Pipeline stage: skip articles that nearly duplicate one already kept this run"""
+        article = job['article']
+        match = self.deduplicator.check(article, job['content'])
+        if match is None:
+            return job
+        
+        kept, similarity = match
+        print(f"\n[{job['index']}/{job['total']}] Skipping duplicate {article['source']}: {article['title'][:50]} "
+              f"(of {kept['source']}: {kept['title'][:50]}, similarity {similarity:.2f})")
+        # Handled: later runs and --resume must not generate it on its own
+        if self.seen_index:
+            self.seen_index.mark_posted(article, job['content'])
+        self.checkpoint.finish(article['url'])
+        return SKIP
+    
+    def _generate_stage(self, job: Dict) -> Dict:
+        """Pipeline stage: generate the LinkedIn post for one article"""
+        article = job['article']
+        print(f"\n[{job['index']}/{job['total']}] Generating {article['source']}: {article['title'][:50]}...")
+        
+        if self.async_mode:
+            # GenerationError fails the item: nothing is logged and --resume retries it
+            post = self.generator.run(self.generator.generate_async(article, job['content']))
+        else:
+            post = self.generator.generate(article, job['content'])
+        print(f"  ✓ [{job['index']}/{job['total']}] Done ({len(post)} chars)")
+        
+        return self._record_post(job, post)
+    
+    def _generate_pack_stage(self, jobs: List[Dict]) -> List[Dict]:
+        """Pipeline stage: generate posts for up to PACK_SIZE waiting articles with one request"""
+        print(f"\nGenerating {len(jobs)} posts in one request: "
+              f"{', '.join(str(job['index']) for job in jobs)}/{jobs[0]['total']}...")
+        
+        posts = self.generator.generate_packed([(job['article'], job['content']) for job in jobs])
+        return [self._record_post(job, post) for job, post in zip(jobs, posts)]
+    
+    def _generate_batch(self, jobs: List[Dict]) -> List[Dict]:
+        """Generate posts for all extracted jobs with one OpenAI batch"""
+        if not jobs:
+            return []
+        
+        self.checkpoint.save()  # Keep extracted content while the batch runs
+        print(f"\nSubmitting {len(jobs)} articles to the OpenAI Batch API...")
+        # The batch id goes into the checkpoint, so --resume collects it instead of paying for a new one
+        posts = self.generator.generate_batch(
+            [(job['article'], job['content']) for job in jobs],
+            poll_interval=self.config.batch_poll_interval,
+            resume=self.checkpoint.batch if self.resumed else None,
+            on_batch=self.checkpoint.save_batch
+        )
+        return [self._record_post(job, post) for job, post in zip(jobs, posts)]
+    
+    def _record_post(self, job: Dict, post: str) -> Dict:
+        """Write a finished post to the post log, seen index and checkpoint"""
+        article = job['article']
+        failed = post.startswith("Error generating post")
+        if self.seen_index and not failed:
+            self.seen_index.mark_posted(article, job['content'])
+        
+        self.post_log.append({
+            'source': article['source'],
+            'article_url': article['url'],
+            'article_title': article['title'],
+            'linkedin_post': post,
+            'generated_at': datetime.now().isoformat()
+        }, index=job['index'])
+        if not failed:
+            self.checkpoint.finish(article['url'])
+        
+        # The post itself lives in the log; keep only what the summary needs
+        return {'source': article['source'], 'article_url': article['url']}
+    
+    def save_results(self):
+        """Render the post log to the TXT file grouped by source with easy copy-paste format"""
         output_file = self.config.output_file
         
-        # Create output directory if it doesn't exist
-        output_path = Path(output_file)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Group results by source
-        grouped = {}
-        for result in results:
-            source = result['source']
-            if source not in grouped:
-                grouped[source] = []
-            grouped[source].append(result)
-        
-        # Save as TXT grouped by category
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for source in ['Fullstack', 'Docker', 'AWS DevOps']:
-                if source not in grouped:
-                    continue
-                
-                posts = grouped[source]
-                
-                # Category header
-                f.write(f"{'=' * 70}\n")
-                f.write(f"{source.upper()} POSTS ({len(posts)})\n")
-                f.write(f"{'=' * 70}\n\n")
-                
-                # Write posts for this category
-                for result in posts:
-                    f.write(result['linkedin_post'])
-                    f.write(f"\n\n{'- ' * 35}\n\n")
-                
-                f.write("\n")
+        with span('file_write'):
+            written = self.post_log.render(output_file)
         
-        self.log(f"\n✓ Saved {len(results)} posts to {output_file}")
+        self.log(f"\n✓ Saved {written} posts to {output_file}")
+    
+    def log_http_stats(self):
+        """Log connection pooling and cache counters for this run"""
+        protocol = "HTTP/2" if self.http_client.http2 else "HTTP/1.1"
+        self.log(f"\nHTTP ({protocol}): {self.http_client.stats.summary()}")
+        if self.http_client.cache:
+            self.log(f"HTTP cache: {self.http_client.cache.summary()}")
+    
+    def log_stage_timings(self):
+        """Log p50/p95/max per stage (and per source) for this run"""
+        lines = METRICS.report_lines()
+        if lines:
+            self.log(f"\nStage timings:")
+            for line in lines:
+                self.log(line)
     
     def save_meta(self):
-        """Save meta information (log messages) to meta.txt"""
+        """Save meta information (log messages) to meta.txt, with stage metrics next to it"""
         meta_file = "output/meta.txt"
         
         # Create output directory if it doesn't exist
         Path("output").mkdir(parents=True, exist_ok=True)
         
+        self.log_stage_timings()
+        
         with open(meta_file, 'w', encoding='utf-8') as f:
             f.write('\n'.join(self.log_messages))
         
         print(f"✓ Saved execution log to {meta_file}")
+        
+        metrics_format = self.config.metrics_format
+        exports = []
+        if metrics_format in ('json', 'both'):
+            exports.append(("output/metrics.json", METRICS.to_json()))
+        if metrics_format in ('prometheus', 'both'):
+            exports.append(("output/metrics.prom", METRICS.to_prometheus()))
+        
+        for metrics_file, text in exports:
+            with open(metrics_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+            print(f"✓ Saved stage metrics to {metrics_file}")
 
 
 def main():
     """Entry point"""
-    app = LinkedInPostApp()
-    app.run()
+    parser = argparse.ArgumentParser(description="Generate LinkedIn posts from tech blogs")
+    parser.add_argument(
+        '--regenerate', action='store_true',
+        help="ignore cached posts and call the OpenAI API for every article"
+    )
+    parser.add_argument(
+        '--full', action='store_true',
+        help="process every crawled article, including ones already posted"
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help="continue an interrupted run, generating only the articles it did not finish"
+    )
+    parser.add_argument(
+        '--batch', action='store_true',
+        help="generate through the OpenAI Batch API (cheaper, may take hours)"
+    )
+    args = parser.parse_args()
+    
+    app = LinkedInPostApp(regenerate=args.regenerate, full=args.full, resume=args.resume, batch=args.batch)
+    try:
+        app.run()
+    except KeyboardInterrupt:
+        print("\n⚠ Interrupted. Finished posts are saved; run `python3 main.py --resume` to continue.")
 
 
 if __name__ == "__main__":
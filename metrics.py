@@ -0,0 +1,143 @@
+"""
+Metrics - Per-stage timing spans with per-source and per-article breakdowns
+"""
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Stages in workflow order (used to order reports)
+STAGES = [
+    'index_fetch', 'index_parse', 'content_stream', 'content_fetch', 'content_parse',
+    'prompt_build', 'llm_call', 'llm_first_token', 'llm_batch', 'file_write',
+]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _stats(values: List[float]) -> Dict[str, float]:
+    return {
+        'count': len(values),
+        'total_s': sum(values),
+        'p50_ms': percentile(values, 0.50) * 1000,
+        'p95_ms': percentile(values, 0.95) * 1000,
+        'max_ms': max(values) * 1000,
+    }
+
+
+class Metrics:
+    """Thread-safe collector of timing spans"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = []  # (stage, source, article, seconds)
+    
+    @contextmanager
+    def span(self, stage: str, source: Optional[str] = None, article: Optional[str] = None):
+        """
+        Time the enclosed block
+        
+        Args:
+            stage: Stage name, e.g. 'index_fetch' or 'llm_call'
+            source: Blog source the work belongs to
+            article: Article URL the work belongs to
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, source, article)
+    
+    def record(self, stage: str, seconds: float, source: Optional[str] = None, article: Optional[str] = None):
+        with self.lock:
+            self.records.append((stage, source, article, seconds))
+    
+    def reset(self):
+        with self.lock:
+            self.records = []
+    
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Aggregate spans per stage, with a per-source breakdown
+        
+        Returns:
+            {stage: {count, total_s, p50_ms, p95_ms, max_ms, by_source: {source: {...}}}}
+        """
+        with self.lock:
+            records = list(self.records)
+        
+        by_stage = {}
+        for stage, source, _, seconds in records:
+            entry = by_stage.setdefault(stage, {'all': [], 'sources': {}})
+            entry['all'].append(seconds)
+            entry['sources'].setdefault(source or 'all', []).append(seconds)
+        
+        ordered = sorted(by_stage, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES))
+        return {
+            stage: dict(
+                _stats(by_stage[stage]['all']),
+                by_source={source: _stats(values) for source, values in by_stage[stage]['sources'].items()}
+            )
+            for stage in ordered
+        }
+    
+    def by_article(self) -> Dict[str, Dict[str, float]]:
+        """Seconds spent per stage for every article: {url: {stage: seconds}}"""
+        with self.lock:
+            records = list(self.records)
+        
+        articles = {}
+        for stage, _, article, seconds in records:
+            if article:
+                stages = articles.setdefault(article, {})
+                stages[stage] = stages.get(stage, 0.0) + seconds
+        return articles
+    
+    def report_lines(self) -> List[str]:
+        """Human-readable per-stage summary for logs and meta.txt"""
+        lines = []
+        for stage, stats in self.summary().items():
+            lines.append(f"  • {stage}: {stats['count']} spans, p50 {stats['p50_ms']:.0f} ms, "
+                         f"p95 {stats['p95_ms']:.0f} ms, max {stats['max_ms']:.0f} ms")
+            if len(stats['by_source']) > 1:
+                for source, source_stats in stats['by_source'].items():
+                    lines.append(f"      {source}: {source_stats['count']} spans, "
+                                 f"p50 {source_stats['p50_ms']:.0f} ms, p95 {source_stats['p95_ms']:.0f} ms, "
+                                 f"max {source_stats['max_ms']:.0f} ms")
+        return lines
+    
+    def to_json(self) -> str:
+        return json.dumps({'stages': self.summary(), 'articles': self.by_article()}, indent=2)
+    
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (summary metric per stage and source)"""
+        name = 'linkedin_stage_duration_seconds'
+        lines = [
+            f"# HELP {name} Time spent in each workflow stage",
+            f"# TYPE {name} summary",
+        ]
+        for stage, stats in self.summary().items():
+            for source, s in stats['by_source'].items():
+                labels = f'stage="{stage}",source="{source}"'
+                lines.append(f'{name}{{{labels},quantile="0.5"}} {s["p50_ms"] / 1000:.6f}')
+                lines.append(f'{name}{{{labels},quantile="0.95"}} {s["p95_ms"] / 1000:.6f}')
+                lines.append(f'{name}{{{labels},quantile="1"}} {s["max_ms"] / 1000:.6f}')
+                lines.append(f'{name}_sum{{{labels}}} {s["total_s"]:.6f}')
+                lines.append(f'{name}_count{{{labels}}} {s["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide collector shared by crawlers, generator and app
+METRICS = Metrics()
+
+
+def span(stage: str, source: Optional[str] = None, article: Optional[str] = None):
+    """Time a block on the shared collector"""
+    return METRICS.span(stage, source, article)
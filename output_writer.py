@@ -0,0 +1,160 @@
+"""
+Output Writer - Append-only JSONL log of generated posts
+
+Each post is appended (and flushed to disk) as soon as it is generated, so a
+crash keeps everything written so far and the log can be tailed during a run.
+The grouped TXT view is rendered from the log at the end.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Default section order of the rendered TXT file
+SOURCE_ORDER = ['Fullstack', 'Docker', 'AWS DevOps']
+
+
+class PostLog:
+    """JSONL post log that keeps only file offsets in memory"""
+    
+    def __init__(self, path: str, keep: Optional[set] = None, source_order: Optional[List[str]] = None):
+        """
+        Open the log
+        
+        Args:
+            path: JSONL file to append posts to
+            keep: Resume an existing log, keeping posts for these article URLs;
+                None starts a fresh log (a previous log at the path is replaced
+                when the first post is written, so a run without posts keeps it)
+            source_order: Section order of the TXT file (default: SOURCE_ORDER);
+                other sources follow alphabetically
+        """
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.source_order = source_order or SOURCE_ORDER
+        self.offsets = {}  # source -> [(article index, byte offset)]
+        self.file = None  # Opened by the first append() unless resuming
+        
+        if keep is not None and os.path.exists(path):
+            self.file = open(path, 'r+b')
+            self._reindex(keep)
+    
+    def _reindex(self, keep: set):
+        """
+        Index the kept posts of an existing log and drop every other line
+        
+        Error placeholders and posts superseded by a later line for the same
+        article are removed, so retried articles appear once; the log is
+        rewritten only when there is something to remove.
+        """
+        latest = {}  # url -> (source, index, offset); a later line for the same URL wins
+        offset = lines = 0
+        
+        for line in self.file:
+            if not line.endswith(b'\n'):
+                break  # Partial write from a crash
+            result = json.loads(line)
+            if result['article_url'] in keep:
+                latest[result['article_url']] = (result['source'], result.get('index', 0), offset)
+            offset += len(line)
+            lines += 1
+        
+        if len(latest) == lines:
+            self.file.seek(offset)
+            self.file.truncate()
+            for source, index, line_offset in latest.values():
+                self.offsets.setdefault(source, []).append((index, line_offset))
+            return
+        
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as compacted:
+            for source, index, line_offset in sorted(latest.values(), key=lambda entry: entry[2]):
+                self.file.seek(line_offset)
+                self.offsets.setdefault(source, []).append((index, compacted.tell()))
+                compacted.write(self.file.readline())
+            compacted.flush()
+            os.fsync(compacted.fileno())
+        
+        self.file.close()
+        os.replace(tmp_path, self.path)
+        self.file = open(self.path, 'r+b')
+        self.file.seek(0, os.SEEK_END)
+    
+    def append(self, result: Dict, index: int = 0):
+        """
+        Write one result and flush it to disk
+        
+        Args:
+            result: Dict with 'source', 'article_url', 'article_title', 'linkedin_post', 'generated_at'
+            index: Position of the article in the run (keeps the TXT in crawl order)
+        """
+        line = (json.dumps(dict(result, index=index), ensure_ascii=False) + '\n').encode('utf-8')
+        
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, 'wb')
+            offset = self.file.tell()
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.offsets.setdefault(result['source'], []).append((index, offset))
+    
+    def _sources(self) -> List[str]:
+        """Sources with posts, in section order"""
+        extra = sorted(set(self.offsets) - set(self.source_order))
+        return [source for source in self.source_order + extra if source in self.offsets]
+    
+    def counts(self) -> Dict[str, int]:
+        """Posts written per source, in section order"""
+        with self.lock:
+            return {source: len(self.offsets[source]) for source in self._sources()}
+    
+    def __len__(self) -> int:
+        return sum(self.counts().values())
+    
+    def render(self, output_file: str) -> int:
+        """
+        Write the grouped TXT view from the log
+        
+        Posts are read back one at a time, so memory stays flat however many
+        posts the log holds. The file is replaced atomically.
+        
+        Returns:
+            Number of posts written
+        """
+        with self.lock:
+            if self.file is not None and not self.file.closed:
+                self.file.flush()
+            sections: List[Tuple[str, List[Tuple[int, int]]]] = [
+                (source, sorted(self.offsets[source])) for source in self._sources()
+            ]
+        
+        Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = f"{output_file}.tmp"
+        written = 0
+        
+        with open(self.path, 'rb') as log, open(tmp_file, 'w', encoding='utf-8') as f:
+            for source, entries in sections:
+                # Category header
+                f.write(f"{'=' * 70}\n")
+                f.write(f"{source.upper()} POSTS ({len(entries)})\n")
+                f.write(f"{'=' * 70}\n\n")
+                
+                # Write posts for this category
+                for _, offset in entries:
+                    log.seek(offset)
+                    f.write(json.loads(log.readline())['linkedin_post'])
+                    f.write(f"\n\n{'- ' * 35}\n\n")
+                    written += 1
+                
+                f.write("\n")
+        
+        os.replace(tmp_file, output_file)
+        return written
+    
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
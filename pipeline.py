@@ -0,0 +1,239 @@
+"""
+Pipeline - Streaming producer/consumer stages connected by bounded queues
+"""
+import queue
+import threading
+import time
+from typing import Callable, Iterable, List
+
+_DONE = object()  # End-of-stream marker passed between stages
+SKIP = object()  # Return from a stage function to drop the item without failing it
+_FAILED = object()  # Internal marker for items whose stage function raised
+_GAP = object()  # Stands in for a dropped item on its way to an ordered stage
+
+
+class Stage:
+    """A pipeline stage: a function run by a pool of worker threads"""
+    
+    def __init__(self, name: str, func: Callable, workers: int = 1, batch_size: int = 1, ordered: bool = False):
+        """
+        Initialize the stage
+        
+        Args:
+            name: Stage name used in the stats report
+            func: Called with each item; its return value goes to the next stage
+            workers: Number of worker threads for this stage
+            batch_size: If > 1, func is called with a list of up to this many
+                waiting items and returns one output per item
+            ordered: Call func in input order even when earlier stages finish
+                items out of order (runs one worker, one item at a time); items
+                are fed into the pipeline at most a window ahead of this stage,
+                so early arrivals held back here stay bounded
+        """
+        self.name = name
+        self.func = func
+        self.ordered = ordered
+        self.workers = 1 if ordered else max(1, workers)
+        self.batch_size = 1 if ordered else max(1, batch_size)
+        
+        # Stats
+        self.processed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at = None
+        self.finished_at = None
+        self.max_queue_depth = 0
+        self.queue_depth_total = 0
+        self.lock = threading.Lock()
+    
+    def record(self, queue_depth: int, started: float, finished: float, outcome: str, share: float = 1.0):
+        """Record one processed item ('processed', 'skipped' or 'failed'), `share` of a batched call"""
+        with self.lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.busy_seconds += (finished - started) * share
+            self.started_at = started if self.started_at is None else min(self.started_at, started)
+            self.finished_at = finished if self.finished_at is None else max(self.finished_at, finished)
+            self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+            self.queue_depth_total += queue_depth
+    
+    def summary(self) -> str:
+        """One-line stats summary for logs and meta.txt"""
+        items = self.processed + self.skipped + self.failed
+        wall = (self.finished_at - self.started_at) if items else 0.0
+        throughput = self.processed / wall if wall > 0 else 0.0
+        avg_depth = self.queue_depth_total / items if items else 0.0
+        
+        return (f"{self.name}: {self.processed} done, {self.skipped} skipped, {self.failed} failed, "
+                f"{self.workers} workers, {throughput:.2f} items/s, "
+                f"busy {self.busy_seconds:.1f}s, "
+                f"queue depth avg {avg_depth:.1f} / max {self.max_queue_depth}")
+
+
+class Pipeline:
+    """Run items through stages concurrently, with backpressure between stages"""
+    
+    def __init__(self, stages: List[Stage], queue_size: int = 16):
+        """
+        Initialize the pipeline
+        
+        Args:
+            stages: Stages in processing order
+            queue_size: Capacity of each inter-stage queue; full queues block upstream workers
+        """
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+    
+    def run(self, items: Iterable) -> List:
+        """
+        Push every item through all stages
+        
+        Items whose stage function raises are dropped and counted as failed;
+        items for which it returns SKIP are dropped and counted as skipped.
+        
+        Returns:
+            Outputs of the last stage, in the same order as the input items
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results = {}
+        threads = []
+        windows = []  # One per ordered stage: items fed but not yet taken by it
+        
+        for position, stage in enumerate(self.stages):
+            inbox = queues[position]
+            if stage.ordered:
+                # Room for full queues and busy workers upstream, so the window only binds behind a straggler
+                window = threading.Semaphore(self.queue_size * (position + 1) +
+                                             sum(earlier.workers for earlier in self.stages[:position]))
+                windows.append(window)
+                inbox = _InOrder(inbox, window)
+            outbox = queues[position + 1] if position + 1 < len(self.stages) else None
+            remaining = [stage.workers]  # Workers still running; the last one forwards _DONE
+            remaining_lock = threading.Lock()
+            # An ordered stage further on must hear about every dropped item to know it will not come
+            gaps = any(later.ordered for later in self.stages[position + 1:])
+            
+            for _ in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stage, inbox, outbox, results, remaining, remaining_lock, gaps),
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+        
+        # Feed the first stage; put() blocks while it is saturated, or an ordered stage is a window behind
+        for index, item in enumerate(items):
+            for window in windows:
+                window.acquire()
+            queues[0].put((index, item))
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_DONE)
+        
+        for thread in threads:
+            thread.join()
+        
+        return [results[index] for index in sorted(results)]
+    
+    def _work(self, stage: Stage, inbox: queue.Queue, outbox, results: dict,
+              remaining: list, remaining_lock: threading.Lock, gaps: bool):
+        """Worker loop for one stage thread"""
+        done = False
+        while not done:
+            depth = inbox.qsize()
+            entry = inbox.get()
+            if entry is _DONE:
+                break
+            if entry[1] is _GAP:
+                if gaps:
+                    outbox.put(entry)
+                continue
+            
+            # Batched stages also take whatever is already waiting, up to batch_size
+            group = [entry]
+            while len(group) < stage.batch_size:
+                try:
+                    entry = inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _DONE:
+                    done = True
+                    break
+                if entry[1] is _GAP:
+                    if gaps:
+                        outbox.put(entry)
+                    continue
+                group.append(entry)
+            
+            started = time.monotonic()
+            outputs = self._call(stage, [item for _, item in group])
+            finished = time.monotonic()
+            
+            for (index, _), output in zip(group, outputs):
+                outcome = 'failed' if output is _FAILED else 'skipped' if output is SKIP else 'processed'
+                stage.record(depth, started, finished, outcome, share=1 / len(group))
+                
+                if outcome != 'processed':
+                    if gaps:
+                        outbox.put((index, _GAP))
+                    continue
+                if outbox is None:
+                    results[index] = output
+                else:
+                    outbox.put((index, output))
+        
+        # The last worker of this stage closes the next stage's input
+        with remaining_lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last and outbox is not None:
+            for _ in range(self._next_workers(stage)):
+                outbox.put(_DONE)
+    
+    def _call(self, stage: Stage, items: List) -> List:
+        """Run the stage function on one item (or a batch); failures become _FAILED"""
+        try:
+            if stage.batch_size == 1:
+                return [stage.func(items[0])]
+            outputs = stage.func(items)
+            if len(outputs) != len(items):
+                raise ValueError(f"returned {len(outputs)} outputs for {len(items)} items")
+            return outputs
+        except Exception as e:
+            print(f"  ⚠ {stage.name} failed: {str(e)}")
+            return [_FAILED] * len(items)
+    
+    def _next_workers(self, stage: Stage) -> int:
+        """Worker count of the stage following the given one"""
+        return self.stages[self.stages.index(stage) + 1].workers
+
+
+class _InOrder:
+    """Inbox of an ordered stage: hands out entries by input index, holding back early arrivals"""
+    
+    def __init__(self, inbox: queue.Queue, window: threading.Semaphore):
+        self.inbox = inbox
+        self.window = window  # Released per entry handed out, letting the feeder add one more
+        self.waiting = {}  # index -> entry that arrived before its turn
+        self.next_index = 0
+        self.done = False
+    
+    def qsize(self) -> int:
+        return self.inbox.qsize() + len(self.waiting)
+    
+    def get(self):
+        """The entry with the next input index (or a gap for it), then _DONE"""
+        while self.next_index not in self.waiting:
+            if self.done:
+                if not self.waiting:
+                    return _DONE
+                self.next_index = min(self.waiting)
+                break
+            entry = self.inbox.get()
+            if entry is _DONE:
+                self.done = True
+            else:
+                self.waiting[entry[0]] = entry
+        self.next_index += 1
+        self.window.release()
+        return self.waiting.pop(self.next_index - 1)
@@ -1,23 +1,55 @@
 """
 Post Generator - Generate LinkedIn posts using AI
 """
+import hashlib
+import json
+import threading
+import time
 from openai import OpenAI
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from generation_cache import GenerationCache
+from metrics import span
+from prompt_budget import PromptBudget, get_budget
+from rate_limiter import RateLimiter
 
 
 class PostGenerator:
     """Generate LinkedIn posts using OpenAI"""
     
-    def __init__(self, api_key: str, custom_hashtags: str = ""):
+    MODEL = "gpt-3.5-turbo"
+    TEMPERATURE = 0.7
+    MAX_TOKENS = 450
+    MAX_OUTPUT_TOKENS = 4096  # Completion limit of MODEL; caps packed requests
+    BATCH_DONE = ('completed', 'failed', 'expired', 'cancelled')
+    
+    def __init__(self, api_key: str, custom_hashtags: str = "",
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[GenerationCache] = None,
+                 force_regenerate: bool = False,
+                 base_url: Optional[str] = None,
+                 budget: Optional[PromptBudget] = None):
         """
         Initialize the post generator
         
         Args:
             api_key: OpenAI API key
             custom_hashtags: Custom hashtags to append to posts
+            rate_limiter: Optional limiter shared by all concurrent generate calls
+            cache: Optional cache of previously generated posts
+            force_regenerate: Skip cache lookups (new posts are still stored)
+            base_url: Optional OpenAI-compatible API endpoint (default: api.openai.com)
+            budget: Token counter and content budget (default: the shared one from prompt_budget)
         """
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, base_url=base_url)
         self.custom_hashtags = custom_hashtags
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.force_regenerate = force_regenerate
+        self.budget = budget or get_budget()
+        self.lock = threading.Lock()
+        self.pack_requests = 0
+        self.pack_fallbacks = 0
     
     def generate(self, article: Dict, content: str = "") -> str:
         """
@@ -30,37 +62,378 @@ class PostGenerator:
         Returns:
             Generated LinkedIn post text with custom hashtags
         """
-        prompt = self._build_prompt(article, content)
+        with span('prompt_build', source=article.get('source'), article=article['url']):
+            prompt = self._build_prompt(article, content)
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=450
+        # Identical prompts with identical settings reuse the stored post
+        cache_key, cached = self._lookup(prompt)
+        if cached is not None:
+            return self._finish(cached)
+        
+        return self._generate_uncached(article, prompt, cache_key)
+    
+    def generate_packed(self, items: List[Tuple[Dict, str]]) -> List[str]:
+        """
+        Generate posts for several articles with one request
+        
+        The format instructions are sent once for the whole pack and the
+        model answers with JSON holding one post per article id. Packs larger
+        than max_pack_size() are split into several requests. Posts that
+        are missing, malformed or do not link their own article fall back
+        to a single-article call.
+        
+        Args:
+            items: (article, content) pairs
+            
+        Returns:
+            One post (or "Error generating post: ..." message) per item, in input order
+        """
+        posts = [None] * len(items)
+        pending = []  # (position, article, content, single prompt, cache key)
+        
+        for position, (article, content) in enumerate(items):
+            with span('prompt_build', source=article.get('source'), article=article['url']):
+                prompt = self._build_prompt(article, content)
+            cache_key, cached = self._lookup(prompt)
+            if cached is not None:
+                posts[position] = self._finish(cached)
+            else:
+                pending.append((position, article, content, prompt, cache_key))
+        
+        size = self.max_pack_size()
+        for start in range(0, len(pending), size):
+            group = pending[start:start + size]
+            if len(group) < 2:
+                continue
+            try:
+                packed = self._complete_packed([(article, content) for _, article, content, _, _ in group])
+            except Exception as e:
+                print(f"  ⚠ Packed request failed ({str(e)}); generating {len(group)} posts one by one")
+                packed = {}
+            
+            with self.lock:
+                self.pack_requests += 1
+                self.pack_fallbacks += len(group) - len(packed)
+            
+            for article_id, (position, _, _, _, cache_key) in enumerate(group, 1):
+                post = packed.get(article_id)
+                if post:
+                    if cache_key:
+                        self.cache.put(cache_key, post)
+                    posts[position] = self._finish(post)
+        
+        # Anything the packed request did not answer gets its own call
+        for position, article, _, prompt, cache_key in pending:
+            if posts[position] is None:
+                posts[position] = self._generate_uncached(article, prompt, cache_key)
+        
+        return posts
+    
+    @classmethod
+    def max_pack_size(cls) -> int:
+        """Most articles one packed request can answer within the model's completion limit"""
+        return max(1, cls.MAX_OUTPUT_TOKENS // cls.MAX_TOKENS)
+    
+    @classmethod
+    def check_pack_size(cls, pack_size: int):
+        """Raise ValueError if PACK_SIZE posts cannot fit in one answer"""
+        if pack_size > cls.max_pack_size():
+            raise ValueError(
+                f"PACK_SIZE must be at most {cls.max_pack_size()}: {pack_size} posts of up to "
+                f"{cls.MAX_TOKENS} tokens do not fit in {cls.MODEL}'s {cls.MAX_OUTPUT_TOKENS}-token answer"
             )
-            post = response.choices[0].message.content.strip()
+    
+    def packing_summary(self) -> str:
+        return f"{self.pack_requests} packed requests, {self.pack_fallbacks} posts fell back to single calls"
+    
+    def generate_batch(self, items: List[Tuple[Dict, str]], poll_interval: float = 30.0,
+                       timeout: float = 24 * 3600, resume: Optional[Dict] = None,
+                       on_batch: Optional[Callable[[Optional[Dict]], None]] = None) -> List[str]:
+        """
+        Generate posts for many articles through the OpenAI Batch API
+        
+        Cache hits are answered directly; every other prompt goes into one
+        JSONL batch file keyed by custom_id, which is submitted and polled
+        until the batch finishes. Batches are cheaper than synchronous calls
+        but may take up to the 24h completion window.
+        
+        Args:
+            items: (article, content) pairs
+            poll_interval: Seconds between batch status checks
+            timeout: Give up waiting after this many seconds
+            resume: Batch submitted by an interrupted run (as passed to on_batch);
+                its results are collected first and only the articles it did not
+                answer go into a new batch
+            on_batch: Called with {'id', 'input_file_id', 'custom_ids'} right after a
+                batch is submitted, and with None once its results have been read,
+                so the caller can persist it for resume
+            
+        Returns:
+            One post (or "Error generating post: ..." message) per item, in input order
+        """
+        posts = [None] * len(items)
+        requests = {}  # custom_id -> (item positions, prompt, cache key)
+        
+        for position, (article, content) in enumerate(items):
+            with span('prompt_build', source=article.get('source'), article=article['url']):
+                prompt = self._build_prompt(article, content)
+            
+            cache_key, cached = self._lookup(prompt)
+            if cached is not None:
+                posts[position] = self._finish(cached)
+                continue
+            
+            # Keyed by URL, so a resumed run can match the answers of an earlier batch
+            custom_id = f"article-{hashlib.sha1(article['url'].encode('utf-8')).hexdigest()[:16]}"
+            requests.setdefault(custom_id, ([], prompt, cache_key))[0].append(position)
+        
+        outputs = {}
+        remaining = {custom_id: prompt for custom_id, (_, prompt, _) in requests.items()}
+        if requests and resume:
+            print(f"  ⏳ Resuming batch {resume['id']}")
+            try:
+                with span('llm_batch'):
+                    outputs = self._wait_batch(resume['id'], poll_interval, timeout)
+                if on_batch:
+                    on_batch(None)
+            except TimeoutError as e:
+                # Still running: keep it for the next resume instead of paying for a second batch
+                outputs = {custom_id: e for custom_id in requests}
+                remaining = {}
+            except Exception as e:
+                print(f"  ⚠ Could not collect batch {resume['id']} ({str(e)}); submitting a new one")
+            # Failed or unanswered requests of the old batch are retried
+            remaining = {custom_id: prompt for custom_id, prompt in remaining.items()
+                         if not isinstance(outputs.get(custom_id), str)}
+        
+        if remaining:
+            try:
+                with span('llm_batch'):
+                    batch = self._submit_batch(remaining)
+                    if on_batch:
+                        on_batch(batch)
+                    outputs.update(self._wait_batch(batch['id'], poll_interval, timeout))
+                if on_batch:
+                    on_batch(None)
+            except Exception as e:
+                outputs.update({custom_id: e for custom_id in remaining if custom_id not in outputs})
+        
+        for custom_id, (positions, _, cache_key) in requests.items():
+            output = outputs.get(custom_id, RuntimeError("no result returned for this request"))
+            if isinstance(output, str):
+                if cache_key:
+                    self.cache.put(cache_key, output)
+                post = self._finish(output)
+            else:
+                post = f"Error generating post: {str(output)}"
+            for position in positions:
+                posts[position] = post
+        
+        return posts
+    
+    def _submit_batch(self, prompts: Dict[str, str]) -> Dict:
+        """
+        Upload the requests and create a batch
+        
+        Returns:
+            {'id', 'input_file_id', 'custom_ids'} of the new batch
+        """
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.MODEL,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": self.TEMPERATURE,
+                    "max_tokens": self.MAX_TOKENS,
+                },
+            }, ensure_ascii=False)
+            for custom_id, prompt in prompts.items()
+        ]
+        batch_file = self.client.files.create(
+            file=("linkedin_posts_batch.jsonl", ('\n'.join(lines) + '\n').encode('utf-8')),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        print(f"  ⏳ Submitted batch {batch.id} with {len(lines)} requests")
+        return {'id': batch.id, 'input_file_id': batch_file.id, 'custom_ids': list(prompts)}
+    
+    def _wait_batch(self, batch_id: str, poll_interval: float, timeout: float) -> Dict:
+        """
+        Poll a batch until it finishes and read its output and error files
+        
+        Returns:
+            custom_id -> post text, or an Exception describing why that request failed
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        deadline = time.monotonic() + timeout
+        while batch.status not in self.BATCH_DONE:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"batch {batch.id} still {batch.status} after {timeout:.0f}s")
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        
+        print(f"  ✓ Batch {batch.id} {batch.status}")
+        if batch.status != 'completed' and not batch.output_file_id:
+            raise RuntimeError(f"batch {batch.id} {batch.status}")
+        
+        outputs = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get('response') or {}
+                if record.get('error') or response.get('status_code') != 200:
+                    error = record.get('error') or response.get('body', {}).get('error') or {}
+                    outputs[record['custom_id']] = RuntimeError(error.get('message', 'batch request failed'))
+                else:
+                    message = response['body']['choices'][0]['message']
+                    content = (message.get('content') or '').strip()
+                    # No text (e.g. a refusal) fails this request only
+                    outputs[record['custom_id']] = content or RuntimeError(message.get('refusal') or 'empty completion')
+        return outputs
+    
+    def _lookup(self, prompt: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look a prompt up in the generation cache
+        
+        Returns:
+            (cache key or None without a cache, cached post or None)
+        """
+        if not self.cache:
+            return None, None
+        cache_key = GenerationCache.make_key(self.MODEL, self.TEMPERATURE, self.MAX_TOKENS, prompt)
+        if self.force_regenerate:
+            return cache_key, None
+        return cache_key, self.cache.get(cache_key)
+    
+    def _generate_uncached(self, article: Dict, prompt: str, cache_key: Optional[str]) -> str:
+        """Call the API for one article and store the post in the cache"""
+        try:
+            post = self._complete(prompt, source=article.get('source'), article_url=article['url'])
             
-            # Append custom hashtags if provided
-            if self.custom_hashtags:
-                post = f"{post}\n\n{self.custom_hashtags}"
+            if cache_key:
+                self.cache.put(cache_key, post)
             
-            return post
+            return self._finish(post)
         except Exception as e:
             return f"Error generating post: {str(e)}"
     
+    def _complete(self, prompt: str, max_tokens: Optional[int] = None, source: Optional[str] = None,
+                  article_url: Optional[str] = None, **options) -> str:
+        """One rate-limited chat completion; returns the stripped message text"""
+        max_tokens = max_tokens or self.MAX_TOKENS
+        if self.rate_limiter:
+            self.rate_limiter.acquire(self.estimate_tokens(prompt, max_tokens))
+        
+        with span('llm_call', source=source, article=article_url):
+            response = self.client.chat.completions.create(
+                model=self.MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=self.TEMPERATURE,
+                max_tokens=max_tokens,
+                **options
+            )
+        return response.choices[0].message.content.strip()
+    
+    def _complete_packed(self, items: List[Tuple[Dict, str]]) -> Dict[int, str]:
+        """
+        Request posts for several articles at once
+        
+        Returns:
+            Article id (1-based position in items) -> post, for every valid post in the answer
+        """
+        sources = {article.get('source') for article, _ in items}
+        with span('prompt_build', source=sources.pop() if len(sources) == 1 else None):
+            prompt = self._build_packed_prompt(items)
+        
+        text = self._complete(
+            prompt,
+            max_tokens=min(self.MAX_TOKENS * len(items), self.MAX_OUTPUT_TOKENS),
+            response_format={"type": "json_object"}
+        )
+        return self._parse_packed(text, [article for article, _ in items])
+    
+    def _parse_packed(self, text: str, articles: List[Dict]) -> Dict[int, str]:
+        """Validate and split a packed JSON answer: {"posts": [{"id": 1, "post": "..."}, ...]}"""
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return {}
+        entries = data.get('posts') if isinstance(data, dict) else None
+        if not isinstance(entries, list):
+            return {}
+        
+        posts = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            article_id, post = entry.get('id'), entry.get('post')
+            if not isinstance(article_id, int) or not 1 <= article_id <= len(articles):
+                continue
+            if not isinstance(post, str) or not post.strip():
+                continue
+            # A post that does not link its own article was mixed up with another one
+            if articles[article_id - 1]['url'] not in post:
+                continue
+            posts[article_id] = post.strip()
+        return posts
+    
+    def _finish(self, post: str) -> str:
+        """Append custom hashtags if provided"""
+        if self.custom_hashtags:
+            post = f"{post}\n\n{self.custom_hashtags}"
+        return post
+    
+    def estimate_tokens(self, prompt: str, max_tokens: Optional[int] = None) -> int:
+        """Token cost of a request: counted prompt tokens plus the completion limit"""
+        return self.budget.count(prompt) + (max_tokens or self.MAX_TOKENS)
+    
     def _build_prompt(self, article: Dict, content: str) -> str:
         """Build the prompt for AI generation"""
-        content_section = ""
-        if content:
-            content_section = f"\nContent Preview: {content[:400]}"
-        
         return f"""Create a professional LinkedIn post about this article.
 
-Title: {article['title']}
-URL: {article['url']}{content_section}
+{self._article_section(article, content)}
+
+{self._format_rules(article['url'])}
+
+Write the LinkedIn post following this exact structure:"""
+    
+    def _build_packed_prompt(self, items: List[Tuple[Dict, str]]) -> str:
+        """Build one prompt asking for a post per article, answered as JSON"""
+        articles = '\n\n'.join(
+            f"[{article_id}]\n{self._article_section(article, content)}"
+            for article_id, (article, content) in enumerate(items, 1)
+        )
+        
+        return f"""Create a professional LinkedIn post for each of these {len(items)} articles.
+
+{articles}
 
-STRICT FORMAT REQUIREMENTS:
+Every post must follow these rules on its own:
+
+{self._format_rules("<that article's URL>")}
+
+Respond with JSON only, in exactly this shape, with one entry per article id:
+{{"posts": [{{"id": 1, "post": "<LinkedIn post for article [1]>"}}]}}"""
+    
+    def _article_section(self, article: Dict, content: str) -> str:
+        content_section = ""
+        if content:
+            content_section = f"\nContent Preview: {self.budget.truncate(content)}"
+        return f"Title: {article['title']}\nURL: {article['url']}{content_section}"
+    
+    def _format_rules(self, url: str) -> str:
+        return f"""STRICT FORMAT REQUIREMENTS:
 1. Start with an attention-grabbing hook (1-2 sentences with an emoji)
 2. Add a blank line
 3. Write EXACTLY 3 key takeaways using this format:
@@ -68,7 +441,7 @@ STRICT FORMAT REQUIREMENTS:
    2️⃣ Second takeaway  
    3️⃣ Third takeaway
 4. Add a blank line
-5. End with "Read more: {article['url']}" (use the ACTUAL URL provided above, not the placeholder [URL])
+5. End with "Read more: {url}" (use the ACTUAL URL provided above, not the placeholder [URL])
 6. Add a blank line
 7. Add 3-5 relevant hashtags (topic-specific, not role-based)
 
@@ -78,6 +451,4 @@ STYLE:
 - Use bullet emojis (1️⃣ 2️⃣ 3️⃣) for takeaways
 - Length: 150-250 words total
 
-IMPORTANT: Always use the actual article URL ({article['url']}) in the "Read more:" line, never use [URL] as a placeholder.
-
-Write the LinkedIn post following this exact structure:"""
+IMPORTANT: Always use the actual article URL ({url}) in the "Read more:" line, never use [URL] as a placeholder."""
@@ -0,0 +1,126 @@
+"""
+Prompt Budget - Local token counting and token-bounded content excerpts
+"""
+import math
+import re
+from typing import Iterable, Optional, Tuple
+
+try:
+    import tiktoken  # Optional: exact token counts for OpenAI models
+except ImportError:
+    tiktoken = None
+
+HEADINGS = ('h1', 'h2', 'h3', 'h4')
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+class PromptBudget:
+    """Count tokens for a model and fit article content into a fixed token budget"""
+    
+    def __init__(self, content_tokens: int = 150, model: str = 'gpt-3.5-turbo', lead_share: float = 0.5):
+        """
+        Initialize the budget
+        
+        Args:
+            content_tokens: Maximum tokens of article content per prompt
+            model: Model whose tokenizer is used (needs tiktoken; estimated otherwise)
+            lead_share: Part of the budget filled with whole lead paragraphs
+                before switching to headings and their first sentences
+        """
+        self.content_tokens = content_tokens
+        self.model = model
+        self.lead_share = lead_share
+        self.encoding = None
+        
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding('cl100k_base')
+    
+    @property
+    def counter(self) -> str:
+        """How tokens are counted, for logs"""
+        return f"tiktoken ({self.encoding.name})" if self.encoding else "estimated (~4 chars/token)"
+    
+    def count(self, text: str) -> int:
+        """Tokens in text for the configured model"""
+        if self.encoding:
+            return len(self.encoding.encode(text))
+        return math.ceil(len(text) / 4)  # ~4 characters per token for English text
+    
+    def truncate(self, text: str, tokens: Optional[int] = None) -> str:
+        """Cut text to at most `tokens` tokens (default: the content budget), at a word boundary"""
+        tokens = self.content_tokens if tokens is None else tokens
+        if tokens <= 0:
+            return ""
+        if self.count(text) <= tokens:
+            return text
+        
+        if self.encoding:
+            cut = self.encoding.decode(self.encoding.encode(text)[:tokens])
+        else:
+            cut = text[:tokens * 4]
+        
+        # Drop the partial last word unless the cut landed on a word boundary
+        if not text[len(cut):len(cut) + 1].isspace() and ' ' in cut:
+            cut = cut.rsplit(' ', 1)[0]
+        return cut.rstrip()
+    
+    def excerpt(self, blocks: Iterable[Tuple[str, str]]) -> str:
+        """
+        Build the most informative excerpt of an article that fits the budget
+        
+        Lead blocks are kept whole until `lead_share` of the budget is used;
+        after that only headings and the first sentence of the paragraph
+        following each heading are kept, so later sections are outlined
+        rather than cut off. Blocks are consumed lazily and iteration stops
+        as soon as the budget is full.
+        
+        Args:
+            blocks: (tag name, text) pairs in document order, e.g. from extract_blocks
+        
+        Returns:
+            Excerpt of at most content_tokens tokens
+        """
+        budget = self.content_tokens
+        lead_budget = budget * self.lead_share
+        parts = []
+        used = 0
+        after_heading = False
+        
+        for tag, text in blocks:
+            if used < lead_budget:
+                piece = text
+            elif tag in HEADINGS:
+                piece = text
+            elif after_heading:
+                piece = SENTENCE_END.split(text, 1)[0]
+            else:
+                continue
+            after_heading = tag in HEADINGS
+            
+            tokens = self.count(piece) + 1  # +1 for the joining space
+            if used + tokens > budget:
+                parts.append(self.truncate(piece, budget - used - 1))
+                break
+            parts.append(piece)
+            used += tokens
+            if used >= budget:
+                break
+        
+        return self.truncate(' '.join(part for part in parts if part))
+
+
+_budget = PromptBudget()
+
+
+def configure_budget(content_tokens: int = 150, model: str = 'gpt-3.5-turbo') -> PromptBudget:
+    """Set the content budget shared by the crawlers and the post generator"""
+    global _budget
+    _budget = PromptBudget(content_tokens, model)
+    return _budget
+
+
+def get_budget() -> PromptBudget:
+    return _budget
@@ -0,0 +1,80 @@
+"""
+Rate Limiter - Token-bucket limits for OpenAI requests and tokens per minute
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket that refills continuously"""
+    
+    def __init__(self, per_minute: float):
+        """
+        Initialize the bucket
+        
+        Args:
+            per_minute: Budget refilled every minute (also the burst capacity)
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens from the bucket, going into debt if needed
+        
+        Reservations are served in call order, so callers never starve.
+        
+        Returns:
+            Seconds the caller must wait before the reservation is valid
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            
+            # A single request larger than the bucket would otherwise wait forever
+            self.tokens -= min(amount, self.capacity)
+            
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Combined requests-per-minute and tokens-per-minute limiter"""
+    
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            requests_per_minute: Request budget per minute (0 disables the limit)
+            tokens_per_minute: Token budget per minute (0 disables the limit)
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+    
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserve one request using the given number of tokens
+        
+        Returns:
+            Seconds the caller must wait before sending it (async callers sleep without blocking)
+        """
+        wait = 0.0
+        
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        
+        return wait
+    
+    def acquire(self, tokens: int = 0):
+        """Block until one request using the given number of tokens is allowed"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,123 @@
+"""
+Tests for PostGenerator.generate_batch against the fake Files/Batches API
+
+Run with:
+    python3 -m unittest discover tests
+"""
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from benchmarks.fake_server import FakeServer
+from checkpoint import Checkpoint
+from post_generator import PostGenerator
+
+
+def articles(count: int):
+    return [({'title': f"Batch test article number {i}", 'url': f"https://example.com/blog/{i}"}, "content " * 20)
+            for i in range(count)]
+
+
+class BatchAPITest(unittest.TestCase):
+    """Batch submission, result mapping and resume on the fake server"""
+    
+    def start_server(self, **options) -> FakeServer:
+        options.setdefault('llm_latency', 0.01)
+        options.setdefault('batch_latency', 0.05)
+        server = FakeServer(**options).start()
+        self.addCleanup(server.stop)
+        return server
+    
+    def generate(self, server: FakeServer, items, **options):
+        generator = PostGenerator('test', base_url=f"{server.url}/v1")
+        with contextlib.redirect_stdout(io.StringIO()):
+            return generator.generate_batch(items, poll_interval=0.02, **options)
+    
+    def test_results_map_to_their_articles(self):
+        server = self.start_server()
+        items = articles(6)
+        posts = self.generate(server, items)
+        
+        # The fake API returns output rows in reverse order
+        for (article, _), post in zip(items, posts):
+            self.assertIn(article['title'], post)
+            self.assertIn(article['url'], post)
+        self.assertEqual(server.counts['batches'], 1)
+    
+    def test_error_file_rows_fail_only_their_articles(self):
+        server = self.start_server(error_rate=0.5, seed=3)
+        items = articles(10)
+        posts = self.generate(server, items)
+        
+        errors = [post for post in posts if post.startswith("Error generating post")]
+        self.assertEqual(len(errors), server.counts['errors'])
+        self.assertTrue(0 < len(errors) < len(items))
+        for post in errors:
+            self.assertEqual(post, "Error generating post: injected error")
+        for (article, _), post in zip(items, posts):
+            if not post.startswith("Error generating post"):
+                self.assertIn(article['url'], post)
+    
+    def test_missing_and_refused_requests(self):
+        server = self.start_server(batch_missing=2, batch_refusals=1)
+        items = articles(5)
+        posts = self.generate(server, items)
+        
+        self.assertEqual(posts[0], "Error generating post: I can't help with that.")
+        for post in posts[1:3]:
+            self.assertFalse(post.startswith("Error generating post"))
+        for post in posts[3:]:
+            self.assertEqual(post, "Error generating post: no result returned for this request")
+    
+    def test_resume_collects_the_submitted_batch(self):
+        server = self.start_server(batch_latency=0.5)
+        items = articles(4)
+        saved = []
+        
+        # Interrupted while polling: the batch is recorded but not collected
+        posts = self.generate(server, items, timeout=0.05, on_batch=saved.append)
+        self.assertTrue(all(post.startswith("Error generating post") for post in posts))
+        self.assertEqual(len(saved), 1)
+        batch = saved[0]
+        self.assertEqual(len(batch['custom_ids']), 4)
+        
+        posts = self.generate(server, items, resume=batch, on_batch=saved.append)
+        self.assertEqual(server.counts['batches'], 1)
+        self.assertIsNone(saved[-1])
+        for (article, _), post in zip(items, posts):
+            self.assertIn(article['url'], post)
+    
+    def test_resume_submits_only_unanswered_requests(self):
+        server = self.start_server(batch_missing=1)
+        items = articles(3)
+        saved = []
+        self.generate(server, items[:2], on_batch=saved.append)
+        
+        # The first batch answered item 0 only; item 1 was missing and item 2 was never sent
+        server.batch_missing = 0
+        posts = self.generate(server, items, resume=saved[0], on_batch=saved.append)
+        self.assertEqual(server.counts['batches'], 2)
+        self.assertEqual(len(saved[-2]['custom_ids']), 2)
+        for (article, _), post in zip(items, posts):
+            self.assertIn(article['url'], post)
+    
+    def test_checkpoint_keeps_the_batch(self):
+        path = os.path.join(tempfile.mkdtemp(), 'checkpoint.json')
+        checkpoint = Checkpoint(path)
+        checkpoint.start([{'url': 'https://example.com/blog/0', 'title': 'Batch test article', 'source': 'Test'}])
+        checkpoint.save_batch({'id': 'batch-1', 'input_file_id': 'file-1', 'custom_ids': ['article-1']})
+        
+        resumed = Checkpoint(path)
+        self.assertTrue(resumed.load())
+        self.assertEqual(resumed.batch['id'], 'batch-1')
+        self.assertEqual(resumed.batch['input_file_id'], 'file-1')
+        
+        resumed.save_batch(None)
+        self.assertTrue(resumed.load())
+        self.assertIsNone(resumed.batch)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Tests for Checkpoint: the snapshot plus journal survives an interrupted run
+
+Run with:
+    python3 -m unittest discover tests
+"""
+import os
+import tempfile
+import unittest
+
+from checkpoint import Checkpoint
+
+
+def articles(start: int, count: int):
+    return [{'url': f"https://example.com/blog/{i}", 'title': f"Article {i}", 'source': 'Test'}
+            for i in range(start, start + count)]
+
+
+class CheckpointTest(unittest.TestCase):
+    """Journal replay and compaction"""
+    
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'checkpoint.json')
+    
+    def test_journal_is_replayed_on_load(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.start(articles(0, 2))
+        checkpoint.add(articles(2, 2))
+        checkpoint.save_content('https://example.com/blog/1', "extracted")
+        checkpoint.save_content('https://example.com/blog/2', "finished")
+        checkpoint.finish('https://example.com/blog/0')
+        checkpoint.finish('https://example.com/blog/2')
+        
+        resumed = Checkpoint(self.path)
+        self.assertTrue(resumed.load())
+        self.assertEqual(len(resumed.articles), 4)
+        self.assertEqual(resumed.done(), {'https://example.com/blog/0', 'https://example.com/blog/2'})
+        self.assertEqual(resumed.content('https://example.com/blog/1'), "extracted")
+        self.assertIsNone(resumed.content('https://example.com/blog/2'))
+    
+    def test_save_compacts_the_journal(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.start(articles(0, 3))
+        checkpoint.finish('https://example.com/blog/0')
+        self.assertTrue(os.path.exists(checkpoint.journal_path))
+        
+        checkpoint.save()
+        self.assertFalse(os.path.exists(checkpoint.journal_path))
+        resumed = Checkpoint(self.path)
+        self.assertTrue(resumed.load())
+        self.assertEqual(resumed.done(), {'https://example.com/blog/0'})
+    
+    def test_torn_journal_line_is_ignored(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.start(articles(0, 2))
+        checkpoint.finish('https://example.com/blog/0')
+        with open(checkpoint.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"done": "https://exa')
+        
+        resumed = Checkpoint(self.path)
+        self.assertTrue(resumed.load())
+        self.assertEqual(resumed.done(), {'https://example.com/blog/0'})
+        
+        # The resumed run keeps journaling after the torn line was dropped
+        resumed.finish('https://example.com/blog/1')
+        again = Checkpoint(self.path)
+        self.assertTrue(again.load())
+        self.assertEqual(len(again.done()), 2)
+        
+        resumed.clear()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(checkpoint.journal_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@ URL Loader - Reads URLs from various file formats
 """
 import json
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 
 class URLLoader:
@@ -87,3 +87,23 @@ class URLLoader:
         else:
             # Try text format as fallback
             return URLLoader.load_from_text(filepath)
+    
+    @staticmethod
+    def load_sources(filepath: str) -> List[Dict]:
+        """
+        Load blog sources, each as a dict with a 'url' key
+        
+        Text files and plain JSON strings give just the URL. JSON entries can
+        also be objects carrying crawler options, e.g.
+            {"url": "https://www.lastweekinaws.com/blog/", "name": "Last Week in AWS",
+             "link_selector": "h2 a"}
+        """
+        sources = []
+        for entry in URLLoader.load(filepath):
+            if isinstance(entry, str):
+                sources.append({'url': entry})
+            elif isinstance(entry, dict) and 'url' in entry:
+                sources.append(entry)
+            else:
+                raise ValueError(f"Source must be a URL or an object with a 'url' key: {entry!r}")
+        return sources